@@ -42,9 +42,68 @@ class SollumzSettings(bpy.types.AddonPreferences):
         subtype='DIR_PATH'
     )
 
+    reuse_materials: bpy.props.BoolProperty(
+        name="Reuse Materials",
+        description="Reuse the material of an identical shader with the same textures instead of creating a new material, also between imported files",
+        default=True
+    )
+
+    persist_material_keys: bpy.props.BoolProperty(
+        name="Reuse Materials of Saved Files",
+        description="Store the shader a material was created from in the material, so materials are also reused after the .blend file is saved and opened again",
+        default=False
+    )
+
+    use_import_cache: bpy.props.BoolProperty(
+        name="Cache Imported Files",
+        description="Store imported files decoded in a binary cache, so importing them again is faster",
+        default=False
+    )
+
+    import_cache_directory: bpy.props.StringProperty(
+        name="Import Cache Folder Path",
+        description="Path to the folder to store the import cache in, only the current user may be able to write to it. The user's cache folder is used if empty",
+        default="",
+        subtype='DIR_PATH'
+    )
+
+    import_cache_size: bpy.props.IntProperty(
+        name="Import Cache Size (MB)",
+        description="Least recently used files are removed from the import cache once it grows larger than this",
+        default=1024,
+        min=1
+    )
+
+    profile_operators: bpy.props.BoolProperty(
+        name="Profile Imports and Exports",
+        description="Record the time spent in every resource class and stage of imports and exports, and report the slowest ones",
+        default=False
+    )
+
+    profile_report_path: bpy.props.StringProperty(
+        name="Profile Report Path",
+        description="JSON file to write the full profile to. The profile is only reported in the operator messages if empty",
+        default="",
+        subtype='FILE_PATH'
+    )
+
     def draw(self, context):
         layout = self.layout
         layout.prop(self, "shared_texture_folder")
+        layout.prop(self, "reuse_materials")
+        col = layout.column()
+        col.enabled = self.reuse_materials
+        col.prop(self, "persist_material_keys")
+        layout.prop(self, "use_import_cache")
+        col = layout.column()
+        col.enabled = self.use_import_cache
+        col.prop(self, "import_cache_directory")
+        col.prop(self, "import_cache_size")
+        layout.operator("sollumz.clear_import_cache")
+        layout.prop(self, "profile_operators")
+        col = layout.column()
+        col.enabled = self.profile_operators
+        col.prop(self, "profile_report_path")
 
 
 def register():
@@ -1,6 +1,8 @@
 from abc import ABC as AbstractClass, abstractmethod
 from xml.etree import ElementTree as ET
 from .codewalker_xml import *
+from .numeric_text import parse_rows, format_rows
+import numpy
 
 
 class YBN:
@@ -33,24 +35,25 @@ class Bounds(ElementTree, AbstractClass):
         self.box_max = VectorProperty('BoxMax')
         self.box_center = VectorProperty('BoxCenter')
         self.sphere_center = VectorProperty('SphereCenter')
-        self.sphere_radius = ValueProperty('SphereRadius', 0.0)
-        self.margin = ValueProperty('Margin', 0)
-        self.volume = ValueProperty('Volume', 0)
+        self.sphere_radius = ValueProperty('SphereRadius', 0.0, float)
+        self.margin = ValueProperty('Margin', 0, float)
+        self.volume = ValueProperty('Volume', 0, float)
         self.inertia = VectorProperty('Inertia')
-        self.material_index = ValueProperty('MaterialIndex', 0)
-        self.material_color_index = ValueProperty('MaterialColourIndex', 0)
-        self.procedural_id = ValueProperty('ProceduralID', 0)
-        self.room_id = ValueProperty('RoomID', 0)
-        self.ped_density = ValueProperty('PedDensity', 0)
-        self.unk_flags = ValueProperty('UnkFlags', 0)
-        self.poly_flags = ValueProperty('PolyFlags', 0)
-        self.unk_type = ValueProperty('UnkType', 0)
+        self.material_index = ValueProperty('MaterialIndex', 0, int)
+        self.material_color_index = ValueProperty(
+            'MaterialColourIndex', 0, int)
+        self.procedural_id = ValueProperty('ProceduralID', 0, int)
+        self.room_id = ValueProperty('RoomID', 0, int)
+        self.ped_density = ValueProperty('PedDensity', 0, int)
+        self.unk_flags = ValueProperty('UnkFlags', 0, int)
+        self.poly_flags = ValueProperty('PolyFlags', 0, int)
+        self.unk_type = ValueProperty('UnkType', 0, int)
 
 
 class BoundsComposite(Bounds):
     def __init__(self):
         super().__init__()
-        self.type = AttributeProperty('type', 'Composite')
+        self.type = AttributeProperty('type', 'Composite', str)
         self.children = BoundListProperty()
 
 
@@ -64,7 +67,7 @@ class BoundItem(Bounds, AbstractClass):
 
     def __init__(self):
         super().__init__()
-        self.type = AttributeProperty('type', self.type)
+        self.type = AttributeProperty('type', self.type, str)
         self.composite_position = VectorProperty('CompositePosition')
         self.composite_rotation = QuaternionProperty('CompositeRotation')
         self.composite_scale = VectorProperty(
@@ -97,7 +100,7 @@ class BoundCloth(BoundItem):
     type = 'Cloth'
 
 
-class VerticesProperty(ElementProperty):
+class VerticesProperty(LazyProperty):
     value_types = (list)
 
     def __init__(self, tag_name: str = 'Vertices', value=None):
@@ -106,34 +109,34 @@ class VerticesProperty(ElementProperty):
     @staticmethod
     def from_xml(element: ET.Element):
         new = VerticesProperty(element.tag, [])
-        text = element.text.strip().split('\n')
-        if len(text) > 0:
-            for line in text:
-                coords = line.strip().split(',')
-                if not len(coords) == 3:
-                    return VerticesProperty.read_value_error(element)
-
-                new.value.append(
-                    Vector((float(coords[0]), float(coords[1]), float(coords[2]))))
+        if element.text:
+            new.set_raw(element.text)
 
         return new
 
+    def decode(self, raw):
+        try:
+            vertices = parse_rows(raw, separator=',')
+        except ValueError:
+            vertices = None
+        if vertices is None or (vertices.size and vertices.shape[1] != 3):
+            raise ValueError(
+                f"Invalid vertices in '<{self.tag_name} />'!")
+
+        return [Vector(vertex) for vertex in vertices.tolist()]
+
     def to_xml(self):
         element = ET.Element(self.tag_name)
-        text = ['\n']
 
         for vertex in self.value:
             # Should be a list of Vectors
             if not isinstance(vertex, Vector):
                 raise TypeError(
                     f"VerticesProperty can only contain Vector objects, not '{type(self.value)}'!")
-            for index, component in enumerate(vertex):
-                text.append(str(component))
-                if index < len(vertex) - 1:
-                    text.append(', ')
-            text.append('\n')
 
-        element.text = ''.join(text)
+        element.text = '\n'
+        if self.value:
+            element.text += format_rows(self.value, ', ') + '\n'
 
         return element
 
@@ -159,35 +162,31 @@ class BoundGeometry(BoundGeometryBVH):
         self.octants = PolygonsProperty('Octants')
 
 
-class BoundListProperty(ListProperty):
+# Bound classes by the value of their type attribute
+BOUND_TYPES = {
+    'Composite': BoundsComposite,
+    'Box': BoundBox,
+    'Sphere': BoundSphere,
+    'Capsule': BoundCapsule,
+    'Cylinder': BoundCylinder,
+    'Disc': BoundDisc,
+    'Cloth': BoundCloth,
+    'Geometry': BoundGeometry,
+    'GeometryBVH': BoundGeometryBVH,
+}
+
+
+class BoundListProperty(PolymorphicListProperty):
     list_type = BoundItem
     tag_name = "Children"
 
-    @staticmethod
-    def from_xml(element: ET.Element):
-        new = BoundListProperty()
-
-        for child in element.iter():
-            if 'type' in child.attrib:
-                bound_type = child.get('type')
-                if bound_type == 'Box':
-                    new.value.append(BoundBox.from_xml(child))
-                elif bound_type == 'Sphere':
-                    new.value.append(BoundSphere.from_xml(child))
-                elif bound_type == 'Capsule':
-                    new.value.append(BoundCapsule.from_xml(child))
-                elif bound_type == 'Cylinder':
-                    new.value.append(BoundCylinder.from_xml(child))
-                elif bound_type == 'Disc':
-                    new.value.append(BoundDisc.from_xml(child))
-                elif bound_type == 'Cloth':
-                    new.value.append(BoundCloth.from_xml(child))
-                elif bound_type == 'Geometry':
-                    new.value.append(BoundGeometry.from_xml(child))
-                elif bound_type == 'GeometryBVH':
-                    new.value.append(BoundGeometryBVH.from_xml(child))
+    @classmethod
+    def get_item_types(cls):
+        return {bound_type: bound_class for bound_type, bound_class in BOUND_TYPES.items() if issubclass(bound_class, BoundItem)}
 
-        return new
+    @classmethod
+    def get_item_key(cls, child: ET.Element):
+        return child.get('type')
 
 
 class MaterialItem(ElementTree):
@@ -195,13 +194,14 @@ class MaterialItem(ElementTree):
 
     def __init__(self):
         super().__init__()
-        self.type = ValueProperty('Type', 0)
-        self.procedural_id = ValueProperty('ProceduralID', 0)
-        self.room_id = ValueProperty('RoomID', 0)
-        self.ped_density = ValueProperty('PedDensity', 0)
+        self.type = ValueProperty('Type', 0, int)
+        self.procedural_id = ValueProperty('ProceduralID', 0, int)
+        self.room_id = ValueProperty('RoomID', 0, int)
+        self.ped_density = ValueProperty('PedDensity', 0, int)
         self.flags = FlagsProperty()
-        self.material_color_index = ValueProperty('MaterialColourIndex', 0)
-        self.unk = ValueProperty('Unk', 0)
+        self.material_color_index = ValueProperty(
+            'MaterialColourIndex', 0, int)
+        self.unk = ValueProperty('Unk', 0, int)
 
 
 class MaterialsListProperty(ListProperty):
@@ -218,31 +218,26 @@ class VertexColorProperty(ElementProperty):
     @staticmethod
     def from_xml(element: ET.Element):
         new = VertexColorProperty(element.tag, [])
-        text = element.text.strip().split('\n')
-        if len(text) > 0:
-            for line in text:
-                colors = line.strip().split(',')
-                if not len(colors) == 4:
-                    return VertexColorProperty.read_value_error(element)
+        try:
+            colors = parse_rows(element.text or '', separator=',')
+        except ValueError:
+            return VertexColorProperty.read_value_error(element)
+        if colors.size and colors.shape[1] != 4:
+            return VertexColorProperty.read_value_error(element)
 
-                new.value.append([int(colors[0]), int(
-                    colors[1]), int(colors[2]), int(colors[3])])
+        new.value = colors.astype(numpy.int64).tolist()
 
         return new
 
     def to_xml(self):
         element = ET.Element(self.tag_name)
-        element.text = '\n'
 
         if(len(self.value) == 0):
             return None
 
-        for color in self.value:
-            for index, component in enumerate(color):
-                element.text += str(int(component * 255))
-                if index < len(color) - 1:
-                    element.text += ', '
-            element.text += '\n'
+        colors = (numpy.array(self.value, dtype=numpy.float64)
+                  * 255).astype(numpy.int64)
+        element.text = '\n' + format_rows(colors, ', ') + '\n'
 
         return element
 
@@ -250,43 +245,54 @@ class VertexColorProperty(ElementProperty):
 class Polygon(ElementTree, AbstractClass):
     def __init__(self):
         super().__init__()
-        self.material_index = AttributeProperty('m', 0)
+        self.material_index = AttributeProperty('m', 0, int)
 
 
-class PolygonsProperty(ListProperty):
+class PolygonsProperty(LazyProperty, PolymorphicListProperty):
     list_type = Polygon
     tag_name = "Polygons"
 
+    def __init__(self, tag_name=None, value=None):
+        super().__init__(tag_name, value)
+
+    @classmethod
+    def get_item_types(cls):
+        return {polygon.tag_name: polygon for polygon in (Box, Sphere, Capsule, Cylinder, Triangle)}
+
+    @classmethod
+    def get_item_key(cls, child: ET.Element):
+        return child.tag
+
     @staticmethod
     def from_xml(element: ET.Element):
         new = PolygonsProperty()
-
-        for child in element.iter():
-            if child.tag == 'Box':
-                new.value.append(Box.from_xml(child))
-            elif child.tag == 'Sphere':
-                new.value.append(Sphere.from_xml(child))
-            elif child.tag == 'Capsule':
-                new.value.append(Capsule.from_xml(child))
-            elif child.tag == 'Cylinder':
-                new.value.append(Cylinder.from_xml(child))
-            elif child.tag == 'Triangle':
-                new.value.append(Triangle.from_xml(child))
+        # Polygons are decoded from the element itself on first access
+        new.set_raw(element)
 
         return new
 
+    def decode(self, raw):
+        value = []
+
+        for child in raw:
+            child_type = self.get_child_type(child)
+            if child_type is not None:
+                value.append(child_type.from_xml(child))
+
+        return value
+
 
 class Triangle(Polygon):
     tag_name = 'Triangle'
 
     def __init__(self):
         super().__init__()
-        self.v1 = AttributeProperty('v1', 0)
-        self.v2 = AttributeProperty('v2', 0)
-        self.v3 = AttributeProperty('v3', 0)
-        self.f1 = AttributeProperty('f1', 0)
-        self.f2 = AttributeProperty('f2', 0)
-        self.f3 = AttributeProperty('f3', 0)
+        self.v1 = AttributeProperty('v1', 0, int)
+        self.v2 = AttributeProperty('v2', 0, int)
+        self.v3 = AttributeProperty('v3', 0, int)
+        self.f1 = AttributeProperty('f1', 0, int)
+        self.f2 = AttributeProperty('f2', 0, int)
+        self.f3 = AttributeProperty('f3', 0, int)
 
 
 class Sphere(Polygon):
@@ -294,8 +300,8 @@ class Sphere(Polygon):
 
     def __init__(self):
         super().__init__()
-        self.v = AttributeProperty('v', 0)
-        self.radius = AttributeProperty('radius', 0)
+        self.v = AttributeProperty('v', 0, int)
+        self.radius = AttributeProperty('radius', 0, float)
 
 
 class Capsule(Polygon):
@@ -303,9 +309,9 @@ class Capsule(Polygon):
 
     def __init__(self):
         super().__init__()
-        self.v1 = AttributeProperty('v1', 0)
-        self.v2 = AttributeProperty('v2', 1)
-        self.radius = AttributeProperty('radius', 0)
+        self.v1 = AttributeProperty('v1', 0, int)
+        self.v2 = AttributeProperty('v2', 1, int)
+        self.radius = AttributeProperty('radius', 0, float)
 
 
 class Box(Polygon):
@@ -313,10 +319,10 @@ class Box(Polygon):
 
     def __init__(self):
         super().__init__()
-        self.v1 = AttributeProperty('v1', 0)
-        self.v2 = AttributeProperty('v2', 1)
-        self.v3 = AttributeProperty('v3', 2)
-        self.v4 = AttributeProperty('v4', 3)
+        self.v1 = AttributeProperty('v1', 0, int)
+        self.v2 = AttributeProperty('v2', 1, int)
+        self.v3 = AttributeProperty('v3', 2, int)
+        self.v4 = AttributeProperty('v4', 3, int)
 
 
 class Cylinder(Polygon):
@@ -324,6 +330,6 @@ class Cylinder(Polygon):
 
     def __init__(self):
         super().__init__()
-        self.v1 = AttributeProperty('v1', 0)
-        self.v2 = AttributeProperty('v2', 1)
-        self.radius = AttributeProperty('radius', 0)
+        self.v1 = AttributeProperty('v1', 0, int)
+        self.v2 = AttributeProperty('v2', 1, int)
+        self.radius = AttributeProperty('radius', 0, float)
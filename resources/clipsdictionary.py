@@ -1,4 +1,5 @@
 from .codewalker_xml import *
+from .numeric_text import parse_numbers, format_columns
 from xml.etree import ElementTree as ET
 from inspect import isclass
 
@@ -14,7 +15,7 @@ class YCD:
         return clips_dict.write_xml(filepath)
 
 
-class ItemTypeListProperty(ListProperty, AbstractClass):
+class ItemTypeListProperty(PolymorphicListProperty, AbstractClass):
     class Item(ElementTree, AbstractClass):
         tag_name = 'Item'
 
@@ -25,20 +26,26 @@ class ItemTypeListProperty(ListProperty, AbstractClass):
 
     list_type = Item
 
+    # Item classes are the ones defined in the class body of the list
     @classmethod
-    def from_xml(cls, element: ET.Element):
-        new = cls()
+    def get_item_types(cls):
         type_map = {}
         for key, item_class in vars(cls).items():
             if isclass(item_class) and issubclass(item_class, ItemTypeListProperty.Item) and key == item_class.__name__:
                 type_map[item_class.type] = item_class
-        for child in element:
-            type_elem = child.find("Type")
-            if type_elem != None:
-                type = type_elem.get("value")
-                if type in type_map:
-                    new.value.append(type_map[type].from_xml(child))
-        return new
+        return type_map
+
+    @classmethod
+    def get_item_key(cls, child: ET.Element):
+        type_elem = child.find("Type")
+        if type_elem is not None:
+            return type_elem.get("value")
+
+    # The class of an item is read from its Type child, which isn't parsed yet when the item starts,
+    # so the list is decoded at once instead of incrementally
+    @classmethod
+    def is_composite(cls):
+        return False
 
 
 class AttributesListProperty(ItemTypeListProperty):
@@ -53,28 +60,28 @@ class AttributesListProperty(ItemTypeListProperty):
         def __init__(self):
             super().__init__()
             self.name_hash = TextProperty('NameHash', '')
-            self.type = ValueProperty("Type", self.type)
+            self.type = ValueProperty("Type", self.type, str)
 
     class FloatAttribute(Attribute):
         type = 'Float'
 
         def __init__(self):
             super().__init__()
-            self.value = ValueProperty('Value', 0.0)
+            self.value = ValueProperty('Value', 0.0, float)
 
     class IntAttribute(Attribute):
         type = 'Int'
 
         def __init__(self):
             super().__init__()
-            self.value = ValueProperty('Value', 0)
+            self.value = ValueProperty('Value', 0, int)
 
     class BoolAttribute(Attribute):
         type = 'Bool'
 
         def __init__(self):
             super().__init__()
-            self.value = ValueProperty('Value', True)
+            self.value = ValueProperty('Value', True, bool)
 
     class Vector3Attribute(Attribute):
         type = 'Vector3'
@@ -82,7 +89,7 @@ class AttributesListProperty(ItemTypeListProperty):
         def __init__(self):
             super().__init__()
             self.value = VectorProperty('Value')
-            self.unknown2c = ValueProperty("Unknown2C", 1)
+            self.unknown2c = ValueProperty("Unknown2C", 1, int)
 
     class Vector4Attribute(Attribute):
         type = 'Vector4'
@@ -96,14 +103,14 @@ class AttributesListProperty(ItemTypeListProperty):
 
         def __init__(self):
             super().__init__()
-            self.value = ValueProperty('Value', '')
+            self.value = ValueProperty('Value', '', str)
 
     class HashStringAttribute(Attribute):
         type = 'HashString'
 
         def __init__(self):
             super().__init__()
-            self.value = ValueProperty('Value', '')
+            self.value = ValueProperty('Value', '', str)
 
     list_type = Attribute
     tag_name = "Attributes"
@@ -118,28 +125,14 @@ class ValuesBuffer(ElementProperty):
     @classmethod
     def from_xml(cls, element: ET.Element):
         new = cls()
-        text = element.text.strip().split('\n')
-        if len(text) > 0:
-            for line in text:
-                items = line.strip().split(" ")
-                for item in items:
-                    new.value.append(float(item))
+        if element.text:
+            new.value = parse_numbers(element.text).tolist()
 
         return new
 
     def to_xml(self):
         element = ET.Element(self.tag_name)
-        columns = 10
-        text = []
-
-        for index, value in enumerate(self.value):
-            text.append(str(value))
-            if index < len(self.value) - 1:
-                text.append(' ')
-            if (index + 1) % columns == 0:
-                text.append('\n')
-
-        element.text = ''.join(text)
+        element.text = format_columns(self.value, 10)
 
         return element
 
@@ -155,7 +148,7 @@ class ChannelsListProperty(ItemTypeListProperty):
 
         def __init__(self):
             super().__init__()
-            self.type = ValueProperty('Type', '')
+            self.type = ValueProperty('Type', '', str)
 
     class StaticQuaternion(Channel):
         type = 'StaticQuaternion'
@@ -176,7 +169,7 @@ class ChannelsListProperty(ItemTypeListProperty):
 
         def __init__(self):
             super().__init__()
-            self.value = ValueProperty('Value', 0.0)
+            self.value = ValueProperty('Value', 0.0, float)
 
     class RawFloat(Channel):
         type = 'RawFloat'
@@ -190,8 +183,8 @@ class ChannelsListProperty(ItemTypeListProperty):
 
         def __init__(self):
             super().__init__()
-            self.quantum = ValueProperty('Quantum', 0.0)
-            self.offset = ValueProperty('Offset', 0.0)
+            self.quantum = ValueProperty('Quantum', 0.0, float)
+            self.offset = ValueProperty('Offset', 0.0, float)
             self.values = ValuesBuffer()
 
     class IndirectQuantizeFloat(QuantizeFloat):
@@ -206,15 +199,15 @@ class ChannelsListProperty(ItemTypeListProperty):
 
         def __init__(self):
             super().__init__()
-            self.numints = ValueProperty('NumInts', 0)
-            self.counts = ValueProperty('Counts', 0)
+            self.numints = ValueProperty('NumInts', 0, int)
+            self.counts = ValueProperty('Counts', 0, int)
 
     class CachedQuaternion1(Channel):
         type = 'CachedQuaternion1'
 
         def __init__(self):
             super().__init__()
-            self.quat_index = ValueProperty('QuatIndex', 0)
+            self.quat_index = ValueProperty('QuatIndex', 0, int)
 
     class CachedQuaternion2(CachedQuaternion1):
         type = 'CachedQuaternion2'
@@ -230,9 +223,9 @@ class Animation(ElementTree):
 
             def __init__(self):
                 super().__init__()
-                self.bone_id = ValueProperty('BoneId', 0)
-                self.track = ValueProperty('Track', 0)
-                self.unk0 = ValueProperty('Unk0', 0)
+                self.bone_id = ValueProperty('BoneId', 0, int)
+                self.track = ValueProperty('Track', 0, int)
+                self.unk0 = ValueProperty('Unk0', 0, int)
 
         list_type = BoneId
         tag_name = "BoneIds"
@@ -257,7 +250,7 @@ class Animation(ElementTree):
             def __init__(self):
                 super().__init__()
                 self.hash = TextProperty('Hash', '')
-                self.frame_count = ValueProperty('FrameCount', 0)
+                self.frame_count = ValueProperty('FrameCount', 0, int)
                 self.sequence_data = Animation.SequenceDataListProperty()
 
         list_type = Sequence
@@ -268,10 +261,10 @@ class Animation(ElementTree):
     def __init__(self):
         super().__init__()
         self.hash = TextProperty('Hash', '')
-        self.unknown10 = ValueProperty('Unknown10', 0)
-        self.frame_count = ValueProperty('FrameCount', 0)
-        self.sequence_frame_limit = ValueProperty('SequenceFrameLimit', 0)
-        self.duration = ValueProperty('Duration', 0.0)
+        self.unknown10 = ValueProperty('Unknown10', 0, int)
+        self.frame_count = ValueProperty('FrameCount', 0, int)
+        self.sequence_frame_limit = ValueProperty('SequenceFrameLimit', 0, int)
+        self.duration = ValueProperty('Duration', 0.0, float)
         self.unknown1C = TextProperty('Unknown1C')
         self.bone_ids = Animation.BoneIdListProperty()
         self.sequences = Animation.SequenceListProperty()
@@ -294,8 +287,8 @@ class Clip(ItemTypeListProperty.Item, AbstractClass):
 
             def __init__(self):
                 super().__init__()
-                self.unknown40 = ValueProperty('Unknown40', 0.0)
-                self.unknown44 = ValueProperty('Unknown44', 0.0)
+                self.unknown40 = ValueProperty('Unknown40', 0.0, float)
+                self.unknown44 = ValueProperty('Unknown44', 0.0, float)
 
         list_type = Tag
         tag_name = "Tags"
@@ -308,8 +301,8 @@ class Clip(ItemTypeListProperty.Item, AbstractClass):
         super().__init__()
         self.hash = TextProperty('Hash', '')
         self.name = TextProperty('Name', '')
-        self.type = ValueProperty('Type', 'Animation')
-        self.unknown30 = ValueProperty('Unknown30', 0)
+        self.type = ValueProperty('Type', 'Animation', str)
+        self.unknown30 = ValueProperty('Unknown30', 0, int)
         self.tags = Clip.TagListProperty()
         self.properties = Clip.PropertyListProperty()
 
@@ -321,16 +314,16 @@ class ClipsListProperty(ItemTypeListProperty):
         def __init__(self):
             super().__init__()
             self.animation_hash = TextProperty('AnimationHash', '')
-            self.start_time = ValueProperty('StartTime', 0.0)
-            self.end_time = ValueProperty('EndTime', 0.0)
-            self.rate = ValueProperty('Rate', 0.0)
+            self.start_time = ValueProperty('StartTime', 0.0, float)
+            self.end_time = ValueProperty('EndTime', 0.0, float)
+            self.rate = ValueProperty('Rate', 0.0, float)
 
     class ClipAnimationList(Clip):
         type = "AnimationList"
 
         def __init__(self):
             super().__init__()
-            self.duration = ValueProperty("Duration", 0.0)
+            self.duration = ValueProperty("Duration", 0.0, float)
             self.animations = ClipsDictionary.AnimationsListProperty()
 
     list_type = Clip
@@ -1,10 +1,40 @@
 """Manages reading/writing Codewalker XML files"""
+import copy
 from mathutils import Vector, Quaternion, Matrix
-from abc import abstractmethod, ABC as AbstractClass, abstractclassmethod
+from abc import abstractmethod, ABC as AbstractClass
 from dataclasses import dataclass
 from typing import Any, Text
 from xml.etree import ElementTree as ET
-from numpy import float32
+from numpy import float32, ndarray
+from .numeric_text import parse_rows, format_rows
+from .profiler import profiler
+
+try:
+    # lxml parses faster and is used for reading when installed. Its elements have the same API as ET.Element
+    from lxml import etree as lxml_etree
+except ImportError:
+    lxml_etree = None
+
+
+"""Incrementally parse the XML file at filepath, yielding (event, element) pairs like ET.iterparse"""
+
+
+def iterparse_xml(filepath, events=("end",)):
+    if lxml_etree is not None:
+        return lxml_etree.iterparse(filepath, events=events, huge_tree=True, remove_comments=True, remove_pis=True)
+    return ET.iterparse(filepath, events=events)
+
+
+"""Parse the XML file at filepath and get the root element"""
+
+
+def parse_xml(filepath):
+    if lxml_etree is not None:
+        parser = lxml_etree.XMLParser(
+            huge_tree=True, remove_comments=True, remove_pis=True)
+        return lxml_etree.parse(filepath, parser).getroot()
+    return ET.parse(filepath).getroot()
+
 
 """Custom indentation to get elements like <VerticesProperty /> to output nicely"""
 
@@ -33,13 +63,116 @@ def indent(elem: ET.Element, level=0):
             elem.text = '\n' + '\n'.join(lines) + i
 
 
+"""Escape element text the same way ElementTree does"""
+
+
+def escape_text(text: str):
+    if "&" in text:
+        text = text.replace("&", "&amp;")
+    if "<" in text:
+        text = text.replace("<", "&lt;")
+    if ">" in text:
+        text = text.replace(">", "&gt;")
+    return text
+
+
+"""Escape an attribute value the same way ElementTree does"""
+
+
+def escape_attrib(text: str):
+    text = escape_text(text)
+    if "\"" in text:
+        text = text.replace("\"", "&quot;")
+    if "\r" in text:
+        text = text.replace("\r", "&#13;")
+    if "\n" in text:
+        text = text.replace("\n", "&#10;")
+    if "\t" in text:
+        text = text.replace("\t", "&#09;")
+    return text
+
+
+class XmlWriter:
+    """Writes elements straight to a text file, formatted the same way as an ET.Element tree passed through indent()"""
+    amount = "  "
+
+    def __init__(self, file):
+        self.write = file.write
+        self.depth = 0
+        # Whether the last start tag is still missing its closing '>'
+        self.open = False
+
+    def start(self, tag: str, attrib: dict = None):
+        write = self.write
+        if self.open:
+            write(">")
+        if self.depth:
+            write("\n" + self.depth * self.amount)
+        write("<" + tag)
+        if attrib:
+            for name, value in attrib.items():
+                write(f' {name}="{escape_attrib(value)}"')
+        self.open = True
+        self.depth += 1
+
+    def end(self, tag: str):
+        self.depth -= 1
+        if self.open:
+            # No children
+            self.write(" />")
+            self.open = False
+            return
+
+        self.write("\n" + self.depth * self.amount + "</" + tag + ">")
+        if not self.depth:
+            self.write("\n")
+
+    """Write an element without children. Multi-line text is indented line by line"""
+
+    def text(self, tag: str, text: str, attrib: dict = None):
+        self.start(tag, attrib)
+        if not text:
+            self.end(tag)
+            return
+
+        write = self.write
+        write(">")
+        self.open = False
+        self.depth -= 1
+
+        stripped = text.strip()
+        if stripped and text.find("\n") != -1:
+            line_indent = (self.depth + 1) * self.amount
+            write("\n")
+            for line in stripped.split("\n"):
+                write(line_indent + escape_text(line) + "\n")
+            write(self.depth * self.amount)
+        else:
+            write(escape_text(text))
+
+        write("</" + tag + ">")
+
+    """Write an ET.Element, i.e. the result of Element.to_xml()"""
+
+    def element(self, element: ET.Element):
+        if not len(element):
+            self.text(element.tag, element.text, element.attrib)
+            return
+
+        self.start(element.tag, element.attrib)
+        for child in element:
+            self.element(child)
+        self.end(element.tag)
+
+
 """Determine if a string is a bool, int, or float"""
 
 
 def get_str_type(value: str):
     if isinstance(value, str):
-        if value.lower() == 'true' or value.lower() == 'false':
-            return bool(value)
+        lower = value.lower()
+        if lower == 'true' or lower == 'false':
+            return lower == 'true'
 
         try:
             return int(value)
@@ -53,6 +186,315 @@ def get_str_type(value: str):
     return value
 
 
+"""Convert a string read from XML to value_type, or guess the type if value_type is None"""
+
+
+def parse_value(value: str, value_type=None):
+    if value_type is None:
+        return get_str_type(value)
+    if value_type is bool:
+        return value.lower() == 'true'
+    return value_type(value)
+
+
+"""Convert a value to the string written to XML. Floats are written like Codewalker does, whole numbers without a
+fraction and others as float32"""
+
+
+def format_value(value):
+    if type(value) is float:
+        value = int(value) if value.is_integer() else float32(value)
+    return str(value)
+
+
+"""Get a hashable key of the content of value. Elements with equal keys are written identically"""
+
+
+def get_content_key(value):
+    if value is None or isinstance(value, (str, int, float, bool, type)):
+        return value
+    if isinstance(value, LazyProperty):
+        return (get_writable_type(value), value.tag_name, get_content_key(value.value))
+    if isinstance(value, (list, tuple)):
+        return (list if isinstance(value, list) else type(value), tuple(get_content_key(item) for item in value))
+    if isinstance(value, dict):
+        return (dict, tuple((key, get_content_key(item)) for key, item in value.items()))
+    if isinstance(value, ndarray):
+        return (ndarray, value.dtype.str, value.shape, value.tobytes())
+    if isinstance(value, (Vector, Quaternion)):
+        return (type(value), tuple(value))
+    if isinstance(value, Matrix):
+        return (Matrix, tuple(tuple(row) for row in value))
+    if isinstance(value, (Element, AttributeProperty)):
+        return (get_writable_type(value), tuple((name, get_content_key(item)) for name, item in vars(value).items()))
+    # Unknown content is never equal to anything else
+    return (id(value),)
+
+
+"""Get the value at path, a tuple of attribute names and list indices, in value"""
+
+
+def get_shared_path(value, path):
+    for key in path:
+        value = value[key] if type(key) is int else getattr(value, key)
+    return value
+
+
+"""Give the holder of root, the view of a shared element it holds, its own copy of the element unless it has one"""
+
+
+def copy_shared_root(root):
+    if object.__getattribute__(root, "_shared_root") is not None:
+        object.__setattr__(root, "__dict__", copy.deepcopy(
+            object.__getattribute__(root, "__dict__")))
+        object.__setattr__(root, "_shared_root", None)
+
+
+"""Get the view of value read at path from root. Elements and lists are viewed, other values are returned as they are"""
+
+
+def get_shared_view(value, root, path):
+    if type(value) is list:
+        return SharedList(value, root, path)
+    if isinstance(value, Element) and not isinstance(value, SharedElement):
+        view = object.__new__(get_shared_type(type(value)))
+        object.__setattr__(view, "__dict__", value.__dict__)
+        object.__setattr__(view, "_shared_root", root)
+        object.__setattr__(view, "_shared_path", path)
+        return view
+    return value
+
+
+"""Get a new view of element for one of the holders it is shared with"""
+
+
+def share_element(element):
+    view = object.__new__(get_shared_type(type(element)))
+    object.__setattr__(view, "__dict__", element.__dict__)
+    object.__setattr__(view, "_shared_root", view)
+    object.__setattr__(view, "_shared_path", ())
+    return view
+
+
+"""Recreate a pickled element from its properties. path is None for an element that isn't shared, and () for the
+view held by a holder"""
+
+
+def restore_shared(writable_type, state, root=None, path=None):
+    element = object.__new__(writable_type)
+    object.__setattr__(element, "__dict__", state)
+    if path is None:
+        return element
+    if root is None:
+        return share_element(element)
+    return get_shared_view(element, root, path)
+
+
+class SharedElement:
+    """Base of the copy-on-write version of an element type, i.e. a shader shared by the drawables of a dictionary.
+    Each holder of the element has its own view of it, and the elements and lists read from a view are views as well.
+    Views read the shared properties until one of them is modified, which first gives the holder its own copy of the
+    element. Vectors and arrays of a shared element are frozen, assigning new ones copies the element"""
+    # The slots are added by get_shared_type(). _shared_root is the holder's view, None once it holds a copy
+    __slots__ = ()
+    writable_type = None
+
+    def __getattribute__(self, name):
+        if name.startswith(("__", "_shared")):
+            return object.__getattribute__(self, name)
+        root = object.__getattribute__(self, "_shared_root")
+        if root is not None and object.__getattribute__(root, "_shared_root") is None:
+            # The holder got its copy through another view
+            self.copy_shared()
+            root = None
+        value = object.__getattribute__(self, name)
+        if root is None:
+            return value
+        return get_shared_view(value, root, object.__getattribute__(self, "_shared_path") + (name,))
+
+    """Switch this view to the holder's copy of the element, copying the element first if needed"""
+
+    def copy_shared(self):
+        root = object.__getattribute__(self, "_shared_root")
+        if root is None:
+            return
+        copy_shared_root(root)
+        if root is not self:
+            target = get_shared_path(
+                root, object.__getattribute__(self, "_shared_path"))
+            object.__setattr__(self, "__dict__", target.__dict__)
+            object.__setattr__(self, "_shared_root", None)
+
+    def __setattr__(self, name, value):
+        self.copy_shared()
+        super().__setattr__(name, value)
+
+    def __delattr__(self, name):
+        self.copy_shared()
+        super().__delattr__(name)
+
+    def __reduce_ex__(self, protocol):
+        # The views of an element hold the same properties, which pickle stores once
+        writable_type = type(self).writable_type
+        root = object.__getattribute__(self, "_shared_root")
+        state = object.__getattribute__(self, "__dict__")
+        if root is None:
+            return (restore_shared, (writable_type, state))
+        if root is self:
+            return (restore_shared, (writable_type, state, None, ()))
+        return (restore_shared, (writable_type, state, root, object.__getattribute__(self, "_shared_path")))
+
+    def __deepcopy__(self, memo):
+        writable = memo[id(self)] = object.__new__(type(self).writable_type)
+        writable.__dict__.update(copy.deepcopy(
+            object.__getattribute__(self, "__dict__"), memo))
+        return writable
+
+
+"""Wrap the list method called name to modify the list of the holder's copy of the element"""
+
+
+def copy_on_write(name):
+    method = getattr(list, name)
+
+    def modify(self, *args, **kwargs):
+        target = self.get_copy()
+        result = method(target, *args, **kwargs)
+        list.__setitem__(self, slice(None), target)
+        return result
+
+    modify.__name__ = name
+    return modify
+
+
+class SharedList(list):
+    """Copy-on-write view of a list read from a shared element, see SharedElement. Modifying it gives the holder its
+    own copy of the element and modifies the list of that copy, which the view then reads"""
+    # _shared_path is replaced by the list of the copy once the holder has one
+    __slots__ = ("_shared_root", "_shared_path")
+
+    def __init__(self, items, root, path):
+        super().__init__(items)
+        self._shared_root = root
+        self._shared_path = path
+
+    """Get the list of the holder's copy of the element, copying the element first if needed"""
+
+    def get_copy(self):
+        root = self._shared_root
+        if root is not None:
+            copy_shared_root(root)
+            self._shared_path = get_shared_path(root, self._shared_path)
+            self._shared_root = None
+            list.__setitem__(self, slice(None), self._shared_path)
+        return self._shared_path
+
+    """Whether items are read from the shared element, otherwise they are read from the holder's copy"""
+
+    def is_shared(self):
+        root = self._shared_root
+        if root is None:
+            return False
+        if object.__getattribute__(root, "_shared_root") is None:
+            # The holder got its copy through another view
+            self.get_copy()
+            return False
+        return True
+
+    def __getitem__(self, index):
+        if not self.is_shared():
+            return self._shared_path[index]
+        value = list.__getitem__(self, index)
+        if isinstance(index, slice):
+            return [get_shared_view(item, self._shared_root, self._shared_path + (position,))
+                    for item, position in zip(value, range(len(self))[index])]
+        if index < 0:
+            index += len(self)
+        return get_shared_view(value, self._shared_root, self._shared_path + (index,))
+
+    def __iter__(self):
+        if not self.is_shared():
+            return iter(self._shared_path)
+        root, path = self._shared_root, self._shared_path
+        return (get_shared_view(item, root, path + (index,)) for index, item in enumerate(list.__iter__(self)))
+
+    def __len__(self):
+        if not self.is_shared():
+            return len(self._shared_path)
+        return list.__len__(self)
+
+    __setitem__ = copy_on_write("__setitem__")
+    __delitem__ = copy_on_write("__delitem__")
+    append = copy_on_write("append")
+    extend = copy_on_write("extend")
+    insert = copy_on_write("insert")
+    pop = copy_on_write("pop")
+    remove = copy_on_write("remove")
+    clear = copy_on_write("clear")
+    sort = copy_on_write("sort")
+    reverse = copy_on_write("reverse")
+
+    def __iadd__(self, items):
+        self.extend(items)
+        return self
+
+    def __imul__(self, count):
+        target = self.get_copy()
+        target *= count
+        list.__setitem__(self, slice(None), target)
+        return self
+
+    def __reduce_ex__(self, protocol):
+        return (list, (list(list.__iter__(self)),))
+
+    def __deepcopy__(self, memo):
+        result = memo[id(self)] = []
+        result.extend(copy.deepcopy(item, memo)
+                      for item in list.__iter__(self))
+        return result
+
+
+# Element type -> copy-on-write version of the element type
+shared_types = {}
+
+
+def get_writable_type(value):
+    return type(value).writable_type if isinstance(value, SharedElement) else type(value)
+
+
+def get_shared_type(cls):
+    shared_type = shared_types.get(cls)
+    if shared_type is None:
+        namespace = {"__slots__": ("_shared_root", "_shared_path"), "__module__": cls.__module__,
+                     "writable_type": cls}
+        if issubclass(cls, ElementTree):
+            # Compiling a schema constructs an instance, which can't be done with a shared type
+            namespace["_schema"] = cls.get_schema()
+        # The base methods come first, so they handle reading and modifying a view
+        shared_type = shared_types[cls] = type(cls)(
+            "Shared" + cls.__name__, (SharedElement, cls), namespace)
+    return shared_type
+
+
+"""Freeze the vectors and arrays in value, so they can't be modified in place while value is shared. Lazy values
+are decoded first"""
+
+
+def freeze_values(value):
+    if isinstance(value, (Element, AttributeProperty)):
+        if isinstance(value, LazyProperty):
+            value.value
+        for child in vars(value).values():
+            freeze_values(child)
+    elif type(value) is list:
+        for item in value:
+            freeze_values(item)
+    elif isinstance(value, (Vector, Quaternion, Matrix)):
+        value.freeze()
+    elif isinstance(value, ndarray):
+        value.flags.writeable = False
+
+
 class Element(AbstractClass):
     """Abstract XML element to base all other XML elements off of"""
     @property
@@ -66,92 +508,296 @@ class Element(AbstractClass):
             f"Invalid XML element '<{element.tag} />' for type '{cls.__name__}'!")
 
     """Convert ET.Element object to Element"""
-    @abstractclassmethod
+    @classmethod
     def from_xml(cls, element: ET.Element):
-        raise NotImplementedError
+        # Generic child-by-child decoding. Leaf elements (values, text, buffers) override this,
+        # elements made of other elements implement the hooks below instead.
+        new = cls.new_from_xml(element)
+        for child in element:
+            child_type = new.get_child_type(child)
+            if child_type is not None:
+                new.set_child(child, new.decode_child(child, child_type))
+        new.finish_from_xml(element)
+        return new
+
+    """Create the object for element before any of its children are decoded"""
+    @classmethod
+    def new_from_xml(cls, element: ET.Element):
+        return cls()
+
+    """Get the Element type that decodes child, or None if child is not part of this element"""
+
+    def get_child_type(self, child: ET.Element):
+        return None
+
+    """Decode child, which is not built incrementally, as child_type"""
+
+    def decode_child(self, child: ET.Element, child_type):
+        return child_type.from_xml(child)
+
+    """Called when child starts being decoded incrementally into new, before any of its children"""
+
+    def start_child(self, child: ET.Element, new):
+        pass
+
+    """Store the decoded value of child"""
+
+    def set_child(self, child: ET.Element, value):
+        pass
+
+    """Called once all children of element have been decoded. Children that get_child_type()
+    did not claim are still attached to element at this point."""
+
+    def finish_from_xml(self, element: ET.Element):
+        pass
+
+    """Whether this type is decoded through the generic from_xml, and can be built incrementally"""
+    @classmethod
+    def is_composite(cls):
+        return getattr(cls.from_xml, "__func__", None) is Element.from_xml.__func__
 
     """Convert object to ET.Element object"""
     @abstractmethod
     def to_xml(self):
         raise NotImplementedError
 
-    """Read XML from filepath"""
+    """Read XML from filepath. root, if given, is the new object the document is decoded into"""
     @classmethod
-    def from_xml_file(cls, filepath):
-        elementTree = ET.ElementTree()
-        elementTree.parse(filepath)
-        return cls.from_xml(elementTree.getroot())
+    def from_xml_file(cls, filepath, root=None):
+        profiling = profiler.enabled
+        with profiler.stage("Build objects", exclude="Tokenize XML"):
+            # Stream the document and decode every subtree as soon as its end tag arrives. Decoded
+            # subtrees are detached from their parent right away, so only the part of the document
+            # that is still being decoded is held as ET nodes.
+            stack = []
+            events = iterparse_xml(filepath, events=("start", "end"))
+            for event, element in profiler.iterate(events, "Tokenize XML"):
+                if event == "start":
+                    if not stack:
+                        element_type = cls
+                    else:
+                        parent = stack[-1][0]
+                        element_type = parent.get_child_type(
+                            element) if parent is not None else None
+
+                    new = None
+                    if not stack and root is not None:
+                        new = root
+                    elif element_type is not None and element_type.is_composite():
+                        new = element_type.new_from_xml(element)
+                        if stack:
+                            stack[-1][0].start_child(element, new)
+                    # Composite elements are built from their start to their end event, time them like from_xml
+                    start = profiler.begin() if profiling and new is not None else None
+                    stack.append((new, element_type, element, start))
+                    continue
+
+                new, element_type, _, start = stack.pop()
+                if new is not None:
+                    new.finish_from_xml(element)
+                    if start is not None:
+                        profiler.end(profiler.classes,
+                                     f"{type(new).__name__}.from_xml", start)
+                    value = new
+                elif element_type is None:
+                    # Not claimed by the parent, leave it for the parent's finish_from_xml()
+                    continue
+                elif not stack:
+                    value = element_type.from_xml(element)
+                else:
+                    value = stack[-1][0].decode_child(element, element_type)
+
+                if not stack:
+                    return value
+
+                parent, _, parent_element, _ = stack[-1]
+                parent.set_child(element, value)
+                parent_element.remove(element)
+
+    """Write object to writer. Elements made of other elements override this to write their children
+    directly, everything else is written from the result of to_xml()"""
+
+    def write(self, writer: XmlWriter):
+        element = self.to_xml()
+        if element is not None:
+            writer.element(element)
 
     """Write object as XML to filepath"""
 
     def write_xml(self, filepath):
-        element = self.to_xml()
-        indent(element)
-        elementTree = ET.ElementTree(element)
-        elementTree.write(filepath, encoding="UTF-8", xml_declaration=True)
+        with profiler.stage("Write XML"), open(filepath, "w", encoding="UTF-8", errors="xmlcharrefreplace") as file:
+            file.write("<?xml version='1.0' encoding='UTF-8'?>\n")
+            self.write(XmlWriter(file))
+
+
+class ElementTreeSchema:
+    """Fields of an ElementTree subclass, read once from a freshly constructed instance"""
+
+    def __init__(self, prototype):
+        # tag -> (property name, Element type)
+        self.children = {}
+        # attribute name -> property name
+        self.attributes = {}
+        self.element_fields = set()
+        self.attribute_fields = set()
+        # Fields holding an ElementProperty or AttributeProperty, accessed through their value
+        self.value_fields = set()
+        # tag -> declared value type of ValueProperty children
+        self.value_types = {}
+
+        for prop_name, obj_element in vars(prototype).items():
+            if isinstance(obj_element, Element):
+                self.element_fields.add(prop_name)
+                self.children.setdefault(
+                    obj_element.tag_name, (prop_name, type(obj_element)))
+                if isinstance(obj_element, ValueProperty) and obj_element.value_type is not None:
+                    self.value_types.setdefault(
+                        obj_element.tag_name, obj_element.value_type)
+            elif isinstance(obj_element, AttributeProperty):
+                self.attribute_fields.add(prop_name)
+                self.attributes.setdefault(obj_element.name, prop_name)
+
+            if isinstance(obj_element, (ElementProperty, AttributeProperty)):
+                self.value_fields.add(prop_name)
+
+
+class PropertyValue:
+    """Data descriptor exposing the value of an ElementProperty or AttributeProperty field. The property
+    object itself stays in the instance dict, and is only replaced when another property object is assigned."""
+
+    __slots__ = ("name", "default")
+
+    def __init__(self, name, default=None):
+        self.name = name
+        # Class attribute shadowed by the field, i.e. BoundBox.type
+        self.default = default
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self.default
+        try:
+            return obj.__dict__[self.name].value
+        except KeyError:
+            # Not assigned yet, i.e. read in __init__ before the field is declared
+            return self.default
+
+    def __set__(self, obj, value):
+        props = obj.__dict__
+        if isinstance(value, (ElementProperty, AttributeProperty)) or self.name not in props:
+            props[self.name] = value
+        else:
+            props[self.name].value = value
 
 
 class ElementTree(Element):
     """XML element that contains children defined by it's properties"""
 
-    """Convert ET.Element object to ElementTree"""
+    def __new__(cls, *args, **kwargs):
+        # Fields are accessed through descriptors, so they have to be installed before the first instance is used
+        if "_schema" not in cls.__dict__:
+            cls.get_schema()
+        return super().__new__(cls)
+
+    """Get the schema of this class, compiling it on first use"""
+    @classmethod
+    def get_schema(cls) -> ElementTreeSchema:
+        if "_schema" not in cls.__dict__:
+            # Mark as compiling, the prototype is an instance of cls as well
+            cls._schema = None
+            schema = ElementTreeSchema(cls())
+            for prop_name in schema.value_fields:
+                setattr(cls, prop_name, PropertyValue(
+                    prop_name, getattr(cls, prop_name, None)))
+            cls._schema = schema
+        return cls._schema
+
+    """Create ElementTree and read the attributes defined in the class definition"""
     @classmethod
-    def from_xml(cls: Element, element: ET.Element):
+    def new_from_xml(cls, element: ET.Element):
         new = cls()
 
-        for prop_name, obj_element in vars(new).items():
-            if isinstance(obj_element, Element):
-                child = element.find(obj_element.tag_name)
-                if child != None and obj_element.tag_name == child.tag:
-                    # Add element to object if tag is defined in class definition
-                    setattr(new, prop_name, type(obj_element).from_xml(child))
-            elif isinstance(obj_element, AttributeProperty):
-                # Add attribute to element if attribute is defined in class definition
-                if obj_element.name in element.attrib and new.tag_name == element.tag:
-                    obj_element.value = element.get(obj_element.name)
+        if new.tag_name == element.tag and element.attrib:
+            attributes = cls.get_schema().attributes
+            props = vars(new)
+            for name, value in element.attrib.items():
+                prop_name = attributes.get(name)
+                if prop_name is not None:
+                    prop = props[prop_name]
+                    prop.value = parse_value(value, prop.value_type)
 
         return new
 
+    def get_child_type(self, child: ET.Element):
+        # Only elements whose tag is defined in the class definition are read
+        entry = self.get_schema().children.get(child.tag)
+        if entry is not None:
+            return entry[1]
+
+    def decode_child(self, child: ET.Element, child_type):
+        value_type = self.get_schema().value_types.get(child.tag)
+        if value_type is not None:
+            return child_type.from_xml(child, value_type)
+        return child_type.from_xml(child)
+
+    def set_child(self, child: ET.Element, value):
+        vars(self)[self.get_schema().children[child.tag][0]] = value
+
     """Convert ElementTree to ET.Element object"""
 
     def to_xml(self):
+        schema = self.get_schema()
         root = ET.Element(self.tag_name)
-        for child in vars(self).values():
-            if isinstance(child, Element):
-                element = child.to_xml()
-                if(element != None):
-                    root.append(element)
+        for prop_name, child in vars(self).items():
+            if prop_name in schema.element_fields:
+                if child is None:
+                    continue
+            elif prop_name in schema.attribute_fields:
+                root.set(child.name, format_value(child.value))
+                continue
             elif isinstance(child, AttributeProperty):
-                root.set(child.name, str(child.value))
+                root.set(child.name, format_value(child.value))
+                continue
+            elif not isinstance(child, Element):
+                continue
+
+            element = child.to_xml()
+            if(element != None):
+                root.append(element)
 
         return root
 
-    def __getattribute__(self, key: str, onlyValue: bool = True):
-        obj = None
-        # Try and see if key exists
-        try:
-            obj = object.__getattribute__(self, key)
-            if isinstance(obj, (ElementProperty, AttributeProperty)) and onlyValue:
-                # If the property is an ElementProperty or AttributeProperty, and onlyValue is true, return just the value of the Element property
-                return obj.value
-            else:
-                return obj
-        except AttributeError:
-            # Key doesn't exist, return None
-            return None
+    def write(self, writer: XmlWriter):
+        schema = self.get_schema()
+        attrib = {}
+        children = []
+        for prop_name, child in vars(self).items():
+            if prop_name in schema.element_fields:
+                if child is None:
+                    continue
+            elif prop_name in schema.attribute_fields:
+                attrib[child.name] = format_value(child.value)
+                continue
+            elif isinstance(child, AttributeProperty):
+                attrib[child.name] = format_value(child.value)
+                continue
+            elif not isinstance(child, Element):
+                continue
 
-    def __setattr__(self, name: str, value) -> None:
-        # Get the full object
-        obj = self.__getattribute__(name, False)
-        if obj and isinstance(obj, (ElementProperty, AttributeProperty)) and not isinstance(value, (ElementProperty, AttributeProperty)):
-            # If the object is an ElementProperty or AttributeProperty, set it's value
-            obj.value = value
-            super().__setattr__(name, obj)
-        else:
-            super().__setattr__(name, value)
+            children.append(child)
+
+        writer.start(self.tag_name, attrib)
+        for child in children:
+            child.write(writer)
+        writer.end(self.tag_name)
+
+    def __getattr__(self, key: str):
+        # Only called when key doesn't exist, return None
+        if key.startswith("__"):
+            raise AttributeError(key)
+        return None
 
     def get_element(self, key):
-        obj = self.__getattribute__(key, False)
+        obj = vars(self).get(key)
 
         if isinstance(obj, ElementProperty):
             return obj
@@ -160,15 +806,9 @@ class ElementTree(Element):
 @dataclass
 class AttributeProperty:
     name: str
-    _value: Any = None
-
-    @property
-    def value(self):
-        return get_str_type(self._value)
-
-    @value.setter
-    def value(self, value):
-        self._value = value
+    value: Any = None
+    # Type the attribute is converted to when read from XML, guessed if None
+    value_type: type = None
 
 
 class ElementProperty(Element, AbstractClass):
@@ -207,21 +847,22 @@ class ListProperty(ElementProperty, AbstractClass):
         super().__init__(tag_name or type(self).tag_name, value or [])
 
     @classmethod
-    def from_xml(cls, element: ET.Element):
-        new = cls(element.tag)
+    def new_from_xml(cls, element: ET.Element):
+        return cls(element.tag)
 
-        children = element.findall(new.list_type.tag_name)
+    def get_child_type(self, child: ET.Element):
+        if child.tag == self.list_type.tag_name:
+            return self.list_type
 
-        for child in children:
-            new.value.append(new.list_type.from_xml(child))
-        return new
+    def set_child(self, child: ET.Element, value):
+        self.value.append(value)
 
     def to_xml(self):
         element = ET.Element(self.tag_name)
 
         for child in vars(self).values():
             if isinstance(child, AttributeProperty):
-                element.set(child.name, str(child.value))
+                element.set(child.name, format_value(child.value))
 
         if self.value and len(self.value) > 0:
             for item in self.value:
@@ -235,6 +876,103 @@ class ListProperty(ElementProperty, AbstractClass):
 
         return None
 
+    def write(self, writer: XmlWriter):
+        if not self.value:
+            return
+
+        attrib = {}
+        for child in vars(self).values():
+            if isinstance(child, AttributeProperty):
+                attrib[child.name] = format_value(child.value)
+
+        writer.start(self.tag_name, attrib)
+        for item in self.value:
+            if not isinstance(item, self.list_type):
+                raise TypeError(
+                    f"{type(self).__name__} can only hold objects of type '{self.list_type.__name__}', not '{type(item)}'")
+            item.write(writer)
+        writer.end(self.tag_name)
+
+
+class PolymorphicListProperty(ListProperty, AbstractClass):
+    """Holds a list of subclasses of list_type. The class of each child is looked up by its key
+    (i.e. its type attribute) in a registry built once per list class."""
+
+    """Get the item classes of this list by their key"""
+    @classmethod
+    @abstractmethod
+    def get_item_types(cls) -> dict:
+        raise NotImplementedError
+
+    """Get the key of child, which selects its class"""
+    @classmethod
+    @abstractmethod
+    def get_item_key(cls, child: ET.Element):
+        raise NotImplementedError
+
+    @classmethod
+    def get_registry(cls) -> dict:
+        if "_registry" not in cls.__dict__:
+            cls._registry = cls.get_item_types()
+        return cls._registry
+
+    def get_child_type(self, child: ET.Element):
+        return self.get_registry().get(self.get_item_key(child))
+
+
+class LazyProperty(ElementProperty, AbstractClass):
+    """Keeps the raw XML of a heavy element, and only decodes it once value is first accessed"""
+
+    def __init__(self, tag_name, value):
+        self._raw = None
+        super().__init__(tag_name, value)
+
+    @property
+    def value(self):
+        if self._raw is not None:
+            raw = self._raw
+            self._raw = None
+            self._value = self.decode(raw)
+        return self._value
+
+    @value.setter
+    def value(self, value):
+        self._raw = None
+        self._value = value
+
+    """Whether value has been decoded (or was set directly)"""
+    @property
+    def is_decoded(self):
+        return self._raw is None
+
+    """Store raw (i.e. the text of the element) to be decoded on first access"""
+
+    def set_raw(self, raw):
+        self._raw = raw
+
+    """Decode the raw XML stored by set_raw() into a value"""
+    @abstractmethod
+    def decode(self, raw):
+        raise NotImplementedError
+
+    def __getstate__(self):
+        # Pickled objects (i.e. the import cache) keep undecoded values raw, so data an import skips (i.e. the
+        # models of LODs that are not imported) is never decoded just to be cached
+        state = self.__dict__.copy()
+        raw = state["_raw"]
+        if raw is not None and not isinstance(raw, str):
+            # lxml elements can't be pickled, raw elements are stored as their XML
+            state["_raw"] = None
+            state["_raw_xml"] = ET.tostring(raw) if isinstance(
+                raw, ET.Element) else lxml_etree.tostring(raw)
+        return state
+
+    def __setstate__(self, state):
+        raw_xml = state.pop("_raw_xml", None)
+        self.__dict__.update(state)
+        if raw_xml is not None:
+            self._raw = ET.fromstring(raw_xml)
+
 
 class TextProperty(ElementProperty):
     value_types = (str)
@@ -326,26 +1064,16 @@ class MatrixProperty(ElementProperty):
 
     @ staticmethod
     def from_xml(element: ET.Element):
-        s_mtx = element.text.strip().replace("\n", "").split("   ")
         m = Matrix()
-        r_idx = 0
-        for item in s_mtx:
-            v_idx = 0
-            for value in item.strip().split(" "):
-                m[r_idx][v_idx] = float(value)
-                v_idx += 1
-            r_idx += 1
+        for r_idx, row in enumerate(parse_rows(element.text or "").tolist()):
+            for v_idx, value in enumerate(row):
+                m[r_idx][v_idx] = value
         return MatrixProperty(element.tag, m)
 
     def to_xml(self):
-        txt = "\n"
-        for i in range(4):
-            txt += f"{str(self.value[i][0])} "
-            txt += f"{str(self.value[i][1])} "
-            txt += f"{str(self.value[i][2])} "
-            txt += f"{str(self.value[i][3])}"
-            txt += "\n"
-        return ET.Element(self.tag_name, Text=txt)
+        element = ET.Element(self.tag_name)
+        element.text = "\n" + format_rows(self.value) + "\n"
+        return element
 
 
 class FlagsProperty(ElementProperty):
@@ -385,21 +1113,17 @@ class FlagsProperty(ElementProperty):
 class ValueProperty(ElementProperty):
     value_types = (int, str, bool, float)
 
-    def __init__(self, tag_name: str, value=0):
+    def __init__(self, tag_name: str, value=0, value_type=None):
         super().__init__(tag_name, value)
+        # Type the value is converted to when read from XML, guessed if None
+        self.value_type = value_type
 
-    @ staticmethod
-    def from_xml(element: ET.Element):
+    @classmethod
+    def from_xml(cls, element: ET.Element, value_type=None):
         if not 'value' in element.attrib:
-            ValueError.read_value_error(element)
+            cls.read_value_error(element)
 
-        return ValueProperty(element.tag, get_str_type(element.get('value')))
+        return cls(element.tag, parse_value(element.get('value'), value_type), value_type)
 
     def to_xml(self):
-        value = self.value
-        if type(value) is int:
-            value = int(self.value)
-        elif type(value) is float:
-            value = int(self.value) if self.value.is_integer(
-            ) else float32(self.value)
-        return ET.Element(self.tag_name, attrib={'value': str(value)})
+        return ET.Element(self.tag_name, attrib={'value': format_value(self.value)})
@@ -2,7 +2,11 @@ from abc import ABC as AbstractClass, abstractmethod
 from xml.etree import ElementTree as ET
 from .codewalker_xml import *
 from ..tools.utils import *
+from ..tools import jenkhash
 from .bound import *
+from .numeric_text import parse_numbers, parse_rows, format_numbers, format_columns
+import copy
+import numpy
 from collections import namedtuple
 from collections.abc import Mapping
 from enum import Enum
@@ -12,9 +16,13 @@ class YDD:
 
     file_extension = ".ydd.xml"
 
+    """Read the drawable dictionary at filepath. If selection is given, only the drawables whose name (in any case)
+    or Jenkins hash (an int) is in selection are decoded"""
     @staticmethod
-    def from_xml_file(filepath):
-        return DrawableDictionary.from_xml_file(filepath)
+    def from_xml_file(filepath, selection=None):
+        if selection is None:
+            return DrawableDictionary.from_xml_file(filepath)
+        return DrawableDictionary.from_xml_file(filepath, DrawableDictionary(selection=selection))
 
     @staticmethod
     def write_xml(drawable_dict, filepath):
@@ -40,13 +48,13 @@ class TextureItem(ElementTree):
     def __init__(self):
         super().__init__()
         self.name = TextProperty("Name", "")
-        self.unk32 = ValueProperty("Unk32", 0)
+        self.unk32 = ValueProperty("Unk32", 0, int)
         self.usage = TextProperty("Usage")
         self.usage_flags = FlagsProperty("UsageFlags")
-        self.extra_flags = ValueProperty("ExtraFlags", 0)
-        self.width = ValueProperty("Width", 0)
-        self.height = ValueProperty("Height", 0)
-        self.miplevels = ValueProperty("MipLevels", 0)
+        self.extra_flags = ValueProperty("ExtraFlags", 0, int)
+        self.width = ValueProperty("Width", 0, int)
+        self.height = ValueProperty("Height", 0, int)
+        self.miplevels = ValueProperty("MipLevels", 0, int)
         self.format = TextProperty("Format")
         self.filename = TextProperty("FileName", "")
 
@@ -66,8 +74,8 @@ class ShaderParameter(ElementTree, AbstractClass):
 
     def __init__(self):
         super().__init__()
-        self.name = AttributeProperty("name")
-        self.type = AttributeProperty("type", self.type)  # ENUM?
+        self.name = AttributeProperty("name", value_type=str)
+        self.type = AttributeProperty("type", self.type, str)  # ENUM?
 
 
 class TextureShaderParameter(ShaderParameter):
@@ -83,10 +91,10 @@ class VectorShaderParameter(ShaderParameter):
 
     def __init__(self):
         super().__init__()
-        self.x = AttributeProperty("x", 0)
-        self.y = AttributeProperty("y", 0)
-        self.z = AttributeProperty("z", 0)
-        self.w = AttributeProperty("w", 0)
+        self.x = AttributeProperty("x", 0, float)
+        self.y = AttributeProperty("y", 0, float)
+        self.z = AttributeProperty("z", 0, float)
+        self.w = AttributeProperty("w", 0, float)
 
 
 class ArrayShaderParameterProperty(ListProperty, ShaderParameter):
@@ -99,26 +107,17 @@ class ArrayShaderParameterProperty(ListProperty, ShaderParameter):
     tag_name = "Item"
 
 
-class ParametersListProperty(ListProperty):
+class ParametersListProperty(PolymorphicListProperty):
     list_type = ShaderParameter
     tag_name = "Parameters"
 
-    @staticmethod
-    def from_xml(element: ET.Element):
-        new = ParametersListProperty()
-
-        for child in element.iter():
-            if 'type' in child.attrib:
-                param_type = child.get('type')
-                if param_type == TextureShaderParameter.type:
-                    new.value.append(TextureShaderParameter.from_xml(child))
-                if param_type == VectorShaderParameter.type:
-                    new.value.append(VectorShaderParameter.from_xml(child))
-                if param_type == ArrayShaderParameterProperty.type:
-                    new.value.append(
-                        ArrayShaderParameterProperty.from_xml(child))
+    @classmethod
+    def get_item_types(cls):
+        return {parameter.type: parameter for parameter in (TextureShaderParameter, VectorShaderParameter, ArrayShaderParameterProperty)}
 
-        return new
+    @classmethod
+    def get_item_key(cls, child: ET.Element):
+        return child.get('type')
 
 
 class ShaderItem(ElementTree):
@@ -128,7 +127,7 @@ class ShaderItem(ElementTree):
         super().__init__()
         self.name = TextProperty("Name", "")
         self.filename = TextProperty("FileName", "")
-        self.render_bucket = ValueProperty("RenderBucket", 0)
+        self.render_bucket = ValueProperty("RenderBucket", 0, int)
         self.parameters = ParametersListProperty()
 
 
@@ -142,7 +141,7 @@ class ShaderGroupProperty(ElementTree):
 
     def __init__(self):
         super().__init__()
-        self.unknown_30 = ValueProperty("Unknown30", 0)
+        self.unknown_30 = ValueProperty("Unknown30", 0, int)
         self.texture_dictionary = TextureDictionaryListProperty()
         self.shaders = ShadersListProperty()
 
@@ -154,11 +153,11 @@ class BoneItem(ElementTree):
         super().__init__()
         # make enum in the future with all of the specific bone names?
         self.name = TextProperty("Name", "")
-        self.tag = ValueProperty("Tag", 0)
-        self.index = ValueProperty("Index", 0)
+        self.tag = ValueProperty("Tag", 0, int)
+        self.index = ValueProperty("Index", 0, int)
         # by default if a bone don't have parent or sibling there should be -1 instead of 0
-        self.parent_index = ValueProperty("ParentIndex", -1)
-        self.sibling_index = ValueProperty("SiblingIndex", -1)
+        self.parent_index = ValueProperty("ParentIndex", -1, int)
+        self.sibling_index = ValueProperty("SiblingIndex", -1, int)
         self.flags = FlagsProperty("Flags")
         self.translation = VectorProperty("Translation")
         self.rotation = QuaternionProperty("Rotation")
@@ -184,10 +183,10 @@ class SkeletonProperty(ElementTree):
         # unknown_1c is either 0 or 16777216, the latter in most cases
         # oiv seems to get unknown_50 and unknown_54 correct somehow
         # unknown_58 is DataCRC in gims, oiv doesn't seem to calc it correctly so they leave it for user to edit this
-        self.unknown_1c = ValueProperty("Unknown1C", 16777216)
-        self.unknown_50 = ValueProperty("Unknown50", 567032952)
-        self.unknown_54 = ValueProperty("Unknown54", 2134582703)
-        self.unknown_58 = ValueProperty("Unknown58", 2503907467)
+        self.unknown_1c = ValueProperty("Unknown1C", 16777216, int)
+        self.unknown_50 = ValueProperty("Unknown50", 567032952, int)
+        self.unknown_54 = ValueProperty("Unknown54", 2134582703, int)
+        self.unknown_58 = ValueProperty("Unknown58", 2503907467, int)
         self.bones = BonesListProperty("Bones")
 
 
@@ -196,8 +195,8 @@ class RotationLimitItem(ElementTree):
 
     def __init__(self):
         super().__init__()
-        self.bone_id = ValueProperty("BoneId", 0)
-        self.unk_a = ValueProperty("UnknownA", 0)
+        self.bone_id = ValueProperty("BoneId", 0, int)
+        self.unk_a = ValueProperty("UnknownA", 0, int)
         self.min = VectorProperty("Min")
         self.max = VectorProperty("Max")
 
@@ -277,10 +276,19 @@ class VertexLayoutListProperty(ElementProperty):
     value_types = (list)
     tag_name = 'Layout'
 
-    # Generate a namedtuple from a vertex layout
+    # Vertex namedtuple types and dtypes by layout items, shared by every layout with the same items
+    vertex_types = {}
+    dtypes = {}
+
+    # Get the namedtuple of a vertex in this layout
     @property
     def vertex_type(self):
-        return namedtuple('Vertex', [name.lower() for name in self.value])
+        key = tuple(self.value)
+        vertex_type = self.vertex_types.get(key)
+        if vertex_type is None:
+            vertex_type = self.vertex_types[key] = namedtuple(
+                'Vertex', [name.lower() for name in key])
+        return vertex_type
 
     @property
     def pretty_vertex_semantic(self):
@@ -313,6 +321,41 @@ class VertexLayoutListProperty(ElementProperty):
     def vertex_semantic(self):
         return "".join([item[0] for item in self.value])
 
+    # Component type and count of every vertex item, by the start of its lowercase name
+    item_formats = {
+        "position": (numpy.float32, 3),
+        "normal": (numpy.float32, 3),
+        "tangent": (numpy.float32, 4),
+        "blend": (numpy.uint8, 4),
+        "colour": (numpy.uint8, 4),
+        "texcoord": (numpy.float32, 2),
+    }
+
+    """Get the numpy structured dtype of a vertex in this layout. The field names are the lowercase item names.
+    sizes overrides the component count of each item (i.e. read from the vertex data)"""
+
+    def get_dtype(self, sizes=None):
+        key = (tuple(self.value), tuple(sizes) if sizes is not None else None)
+        dtype = self.dtypes.get(key)
+        if dtype is None:
+            dtype = self.dtypes[key] = self.create_dtype(sizes)
+        return dtype
+
+    def create_dtype(self, sizes=None):
+        fields = []
+        for index, item in enumerate(self.value):
+            name = item.lower()
+            component_type, size = next((item_format for prefix, item_format in self.item_formats.items(
+            ) if name.startswith(prefix)), (numpy.float32, 4))
+            if sizes is not None:
+                size = sizes[index]
+            fields.append((name, component_type, (size,)))
+        return numpy.dtype(fields)
+
+    @property
+    def dtype(self):
+        return self.get_dtype()
+
     def __init__(self, tag_name=None):
         super().__init__(self.tag_name, [])
         self.type = 'GTAV1'
@@ -333,45 +376,93 @@ class VertexLayoutListProperty(ElementProperty):
         return element
 
 
-class VertexDataProperty(ElementProperty):
-    value_types = (list)
+class VertexDataProperty(LazyProperty):
+    value_types = (list, numpy.ndarray)
+    # Line format strings by vertex dtype
+    format_plans = {}
 
     def __init__(self, tag_name=None):
         super().__init__(tag_name=tag_name or 'Data', value=[])
+        # Layout the vertices are decoded with, set by the vertex buffer
+        self.layout = None
 
     @classmethod
     def from_xml(cls, element: ET.Element):
-        new = cls()
-        if not element.text:
-            return new
-
-        text = element.text.strip().split('\n')
-        if len(text) > 0:
-            for line in text:
-                items = line.strip().split("   ")
-                vert = []
-                for item in items:
-                    words = item.strip().split(" ")
-                    # Convert item to correct type
-                    item = [get_str_type(word) for word in words]
-                    vert.append(item)
-
-                new.value.append(vert)
+        new = cls(element.tag)
+        if element.text:
+            new.set_raw(element.text)
 
         return new
 
+    """Decode the vertices into a numpy structured array with a field per item of the layout"""
+
+    def decode(self, raw):
+        layout = self.layout or VertexLayoutListProperty()
+        rows = parse_rows(raw)
+        if rows.size == 0:
+            return numpy.empty(0, layout.dtype)
+
+        dtype = layout.dtype
+        if sum(dtype[name].shape[0] for name in dtype.names) != rows.shape[1]:
+            # Items of a vertex are separated by 3 spaces, read their sizes from the first line
+            first_line = raw.strip().split('\n', 1)[0]
+            sizes = [len(item.split())
+                     for item in first_line.strip().split("   ")]
+            if len(sizes) != len(layout.value):
+                raise ValueError(
+                    f"Vertices in '<{self.tag_name} />' don't match the layout {layout.value}!")
+            dtype = layout.get_dtype(sizes)
+
+        vertices = numpy.empty(len(rows), dtype)
+        start = 0
+        for name in dtype.names:
+            size = dtype[name].shape[0]
+            vertices[name] = rows[:, start:start + size]
+            start += size
+
+        return vertices
+
+    """Get the format string of a line of vertices of dtype, i.e. '{} {} {}   {} {}   ' and a new line"""
+
+    @classmethod
+    def get_format_plan(cls, dtype):
+        plan = cls.format_plans.get(dtype)
+        if plan is None:
+            plan = cls.format_plans[dtype] = ''.join(
+                [' '.join(['{}'] * dtype[name].shape[0]) + '   ' for name in dtype.names]) + '\n'
+        return plan
+
+    """Convert a list of vertex namedtuples (i.e. built by the exporter) to a structured array"""
+
+    @staticmethod
+    def to_array(vertices):
+        vertices = list(vertices)
+        layout = VertexLayoutListProperty()
+        layout.value = list(getattr(vertices[0], '_fields', None) or [
+            f"item{index}" for index in range(len(vertices[0]))])
+        dtype = layout.get_dtype([len(item) for item in vertices[0]])
+
+        array = numpy.empty(len(vertices), dtype)
+        for index, name in enumerate(dtype.names):
+            array[name] = [vertex[index] for vertex in vertices]
+
+        return array
+
     def to_xml(self):
         if len(self.value) < 1:
             return None
 
+        vertices = self.value
+        if not isinstance(vertices, numpy.ndarray):
+            vertices = self.to_array(vertices)
+
+        # Format whole columns at once, then fill the line format of the layout once per vertex
+        columns = numpy.hstack([format_numbers(vertices[name].reshape(len(vertices), -1))
+                                for name in vertices.dtype.names])
+        line = self.get_format_plan(vertices.dtype).format
+
         element = ET.Element(self.tag_name)
-        text = []
-        for vertex in self.value:
-            for property in vertex:
-                text.append(' '.join([str(item)
-                                      for item in property]) + '   ')
-            text.append('\n')
-        element.text = ''.join(text)
+        element.text = ''.join([line(*vertex) for vertex in columns.tolist()])
 
         return element
 
@@ -381,7 +472,7 @@ class VertexBuffer(ElementTree):
 
     def __init__(self):
         super().__init__()
-        self.flags = ValueProperty("Flags", 0)
+        self.flags = ValueProperty("Flags", 0, int)
         self.layout = VertexLayoutListProperty()
         self.data = VertexDataProperty()
         self.data2 = VertexDataProperty('Data2')
@@ -395,18 +486,15 @@ class VertexBuffer(ElementTree):
     def get_vertex_type(self):
         return self.get_element('layout').vertex_type
 
-    @classmethod
-    def from_xml(cls: Element, element: ET.Element):
-        new = super().from_xml(element)
-        # Convert data to namedtuple matching the layout
-        vert_type = new.get_vertex_type()
-        new.data = list(map(lambda vert: vert_type(*vert), new.data))
-        new.data2 = list(map(lambda vert: vert_type(*vert), new.data2))
-        return new
+    def finish_from_xml(self, element: ET.Element):
+        # Data is decoded into arrays with the dtype of the layout
+        layout = self.get_element('layout')
+        self.get_element('data').layout = layout
+        self.get_element('data2').layout = layout
 
 
-class IndexDataProperty(ElementProperty):
-    value_types = (int)
+class IndexDataProperty(LazyProperty):
+    value_types = (list, numpy.ndarray)
 
     def __init__(self):
         super().__init__(tag_name='Data', value=[])
@@ -414,24 +502,22 @@ class IndexDataProperty(ElementProperty):
     @classmethod
     def from_xml(cls, element: ET.Element):
         new = cls()
-        indices = element.text.strip().replace("\n", "").split()
-        new.value = [int(i) for i in indices]
+        if element.text:
+            new.set_raw(element.text)
 
         return new
 
-    def to_xml(self):
-        element = ET.Element(self.tag_name)
-        columns = 24
-        text = []
+    """Decode the indices into an array of the narrowest unsigned type that holds them"""
 
-        for index, vert_index in enumerate(self.value):
-            text.append(str(vert_index))
-            if index < len(self.value) - 1:
-                text.append(' ')
-            if (index + 1) % columns == 0:
-                text.append('\n')
+    def decode(self, raw):
+        indices = parse_numbers(raw, numpy.uint32)
+        if len(indices) == 0 or indices.max() <= numpy.iinfo(numpy.uint16).max:
+            return indices.astype(numpy.uint16)
+        return indices
 
-        element.text = ''.join(text)
+    def to_xml(self):
+        element = ET.Element(self.tag_name)
+        element.text = format_columns(self.value, 24)
 
         return element
 
@@ -449,7 +535,7 @@ class GeometryItem(ElementTree):
 
     def __init__(self):
         super().__init__()
-        self.shader_index = ValueProperty("ShaderIndex", 0)
+        self.shader_index = ValueProperty("ShaderIndex", 0, int)
         self.bounding_box_min = VectorProperty("BoundingBoxMin")
         self.bounding_box_max = VectorProperty("BoundingBoxMax")
         self.vertex_buffer = VertexBuffer()
@@ -466,11 +552,11 @@ class DrawableModelItem(ElementTree):
 
     def __init__(self):
         super().__init__()
-        self.render_mask = ValueProperty("RenderMask", 0)
-        self.flags = ValueProperty("Flags", 0)
-        self.has_skin = ValueProperty("HasSkin", 0)  # 0 = false, 1 = true
-        self.bone_index = ValueProperty("BoneIndex", 0)
-        self.unknown_1 = ValueProperty("Unknown1", 0)
+        self.render_mask = ValueProperty("RenderMask", 0, int)
+        self.flags = ValueProperty("Flags", 0, int)
+        self.has_skin = ValueProperty("HasSkin", 0, int)  # 0 = false, 1 = true
+        self.bone_index = ValueProperty("BoneIndex", 0, int)
+        self.unknown_1 = ValueProperty("Unknown1", 0, int)
         self.geometries = GeometriesListProperty()
 
 
@@ -490,18 +576,19 @@ class Drawable(ElementTree, AbstractClass):
         super().__init__()
         self.name = TextProperty("Name", "")
         self.bounding_sphere_center = VectorProperty("BoundingSphereCenter")
-        self.bounding_sphere_radius = ValueProperty("BoundingSphereRadius")
+        self.bounding_sphere_radius = ValueProperty(
+            "BoundingSphereRadius", 0, float)
         self.bounding_box_min = VectorProperty("BoundingBoxMin")
         self.bounding_box_max = VectorProperty("BoundingBoxMax")
-        self.lod_dist_high = ValueProperty('LodDistHigh', 0)  # 9998?
-        self.lod_dist_med = ValueProperty('LodDistMed', 0)  # 9998?
-        self.lod_dist_low = ValueProperty('LodDistLow', 0)  # 9998?
-        self.lod_dist_vlow = ValueProperty('LodDistVlow', 0)  # 9998?
-        self.flags_high = ValueProperty('FlagsHigh', 0)
-        self.flags_med = ValueProperty('FlagsMed', 0)
-        self.flags_low = ValueProperty('FlagsLow', 0)
-        self.flags_vlow = ValueProperty('FlagsVlow', 0)
-        self.unknown_9A = ValueProperty('Unknown9A', 0)
+        self.lod_dist_high = ValueProperty('LodDistHigh', 0, float)  # 9998?
+        self.lod_dist_med = ValueProperty('LodDistMed', 0, float)  # 9998?
+        self.lod_dist_low = ValueProperty('LodDistLow', 0, float)  # 9998?
+        self.lod_dist_vlow = ValueProperty('LodDistVlow', 0, float)  # 9998?
+        self.flags_high = ValueProperty('FlagsHigh', 0, int)
+        self.flags_med = ValueProperty('FlagsMed', 0, int)
+        self.flags_low = ValueProperty('FlagsLow', 0, int)
+        self.flags_vlow = ValueProperty('FlagsVlow', 0, int)
+        self.unknown_9A = ValueProperty('Unknown9A', 0, int)
 
         self.shader_group = ShaderGroupProperty()
         self.skeleton = SkeletonProperty()
@@ -517,49 +604,51 @@ class Drawable(ElementTree, AbstractClass):
             "DrawableModelsVeryLow")
         self.bound = None
         self.lights = LightsProperty()
+        # Set by the drawable dictionary, the rest of the drawable is skipped once its name isn't in selection
+        self.selection = None
+        self.skipped = False
 
-    @classmethod
-    def from_xml(cls, element: ET.Element):
-        new = super().from_xml(element)
-        for child in element.iter():
-            if 'type' in child.attrib:
-                bound_type = child.get('type')
-                child.tag = 'Item'
-                if bound_type == 'Box':
-                    new.bound = BoundBox.from_xml(child)
-                elif bound_type == 'Sphere':
-                    new.bound = BoundSphere.from_xml(child)
-                elif bound_type == 'Capsule':
-                    new.bound = BoundCapsule.from_xml(child)
-                elif bound_type == 'Cylinder':
-                    new.bound = BoundCylinder.from_xml(child)
-                elif bound_type == 'Disc':
-                    new.bound = BoundDisc.from_xml(child)
-                elif bound_type == 'Cloth':
-                    new.bound = BoundCloth.from_xml(child)
-                elif bound_type == 'Geometry':
-                    new.bound = BoundGeometry.from_xml(child)
-                elif bound_type == 'GeometryBVH':
-                    new.bound = BoundGeometryBVH.from_xml(child)
-
-                if new.bound:
-                    new.bound.tag_name = 'Bounds'
-
-        return new
+    def get_child_type(self, child: ET.Element):
+        if self.skipped:
+            return None
+        if child.tag == 'Bounds':
+            # Embedded collision, decoded as the bound class of its type
+            return BOUND_TYPES.get(child.get('type'))
+        return super().get_child_type(child)
+
+    def set_child(self, child: ET.Element, value):
+        if child.tag == 'Bounds':
+            value.tag_name = 'Bounds'
+            self.bound = value
+        else:
+            super().set_child(child, value)
+            if child.tag == 'Name' and not DrawableDictionary.is_selected(self.name, self.selection):
+                self.skipped = True
 
     def to_xml(self):
         if self.bound:
             self.bound.tag_name = 'Bounds'
         return super().to_xml()
 
+    def write(self, writer: XmlWriter):
+        if self.bound:
+            self.bound.tag_name = 'Bounds'
+        super().write(writer)
+
 
 class DrawableDictionary(Mapping, Element):
     tag_name = "DrawableDictionary"
 
-    def __init__(self, value=None):
+    def __init__(self, value=None, selection=None):
         super().__init__()
         self._value = value or {}
         self._key = None
+        # Lowercase names and Jenkins hashes of the drawables to decode, all drawables are decoded if None
+        self.selection = self.normalize_selection(selection)
+        # Names of the drawables holding shaders, textures or a skeleton shared with other drawables
+        self._shared = set()
+        # Content key -> (element, [(drawable name, holder, key), ...]), only kept while decoding
+        self._pool = None
 
     # Access drawables by indexing the name (i.e. DrawableDictionary[<drawable name>])
     def __getitem__(self, name):
@@ -580,17 +669,116 @@ class DrawableDictionary(Mapping, Element):
     def sort(self, key):
         self._value = dict(sorted(self._value.items(), key=key))
 
-    @classmethod
-    def from_xml(cls, element: ET.Element):
-        new = cls()
-        new.tag_name = "Item"
-        children = element.findall(new.tag_name)
+    def get_child_type(self, child: ET.Element):
+        if child.tag == "Item":
+            return Drawable
 
-        for child in children:
-            drawable = Drawable.from_xml(child)
-            new._value[drawable.name] = drawable
+    """Get the set of names and Jenkins hashes in a comma separated list, or None if it is empty. Hashes are written
+    as 0x hexadecimal, every other item is a name, even if it is a number"""
+    @staticmethod
+    def parse_selection(text):
+        selection = set()
+        for item in text.split(","):
+            item = item.strip()
+            if not item:
+                continue
+            if item[:2].lower() == "0x":
+                try:
+                    selection.add(int(item, 16))
+                    continue
+                except ValueError:
+                    pass
+            selection.add(item)
 
-        return new
+        return selection or None
+
+    """Names in selection are compared without case, like the game does with their Jenkins hashes"""
+    @staticmethod
+    def normalize_selection(selection):
+        if selection is None:
+            return None
+        return {item.lower() if isinstance(item, str) else item for item in selection}
+
+    """Whether the drawable named name is in selection, a set normalized by normalize_selection()"""
+    @staticmethod
+    def is_selected(name, selection):
+        return selection is None or name.lower() in selection or jenkhash.Generate(name) in selection
+
+    def start_child(self, child: ET.Element, drawable):
+        drawable.selection = self.selection
+
+    def set_child(self, child: ET.Element, drawable):
+        if drawable.skipped or not self.is_selected(drawable.name, self.selection):
+            return
+        self.share(drawable)
+        self._value[drawable.name] = drawable
+
+    def finish_from_xml(self, element: ET.Element):
+        # Every holder of an element decoded more than once gets its own copy-on-write view of it
+        for shared, holders in (self._pool or {}).values():
+            if len(holders) < 2:
+                continue
+            freeze_values(shared)
+            for name, holder, key in holders:
+                self._shared.add(name)
+                if type(key) is int:
+                    holder[key] = share_element(shared)
+                else:
+                    setattr(holder, key, share_element(shared))
+        self._pool = None
+
+    """Get the element identical to element of a previously decoded drawable, or element if there is none.
+    holder[key] (or the attribute key of holder) holds the element in the drawable named owner"""
+
+    def intern(self, element, owner, holder, key):
+        content_key = get_content_key(element)
+        pooled = self._pool.get(content_key)
+        if pooled is None:
+            pooled = self._pool[content_key] = (element, [])
+        pooled[1].append((owner, holder, key))
+        return pooled[0]
+
+    """Replace the shaders, textures and skeleton of drawable by identical ones of previously decoded drawables.
+    Once all drawables are decoded, the drawables holding the same element get copy-on-write views of it"""
+
+    def share(self, drawable):
+        if self._pool is None:
+            self._pool = {}
+
+        name = drawable.name
+        shader_group = drawable.shader_group
+        if shader_group is not None:
+            for items in (shader_group.shaders, shader_group.texture_dictionary):
+                for index, item in enumerate(items):
+                    items[index] = self.intern(item, name, items, index)
+        if drawable.skeleton is not None:
+            drawable.skeleton = self.intern(
+                drawable.skeleton, name, drawable, "skeleton")
+
+    """Get the drawable with the given name with its own copies of the shaders, textures and skeleton it shares
+    with other drawables. Shared elements are copied when they are first modified anyway, this copies them all at
+    once, i.e. before handing the drawable to code that keeps references into it"""
+
+    def get_unshared(self, name):
+        drawable = self[name]
+        if name not in self._shared:
+            return drawable
+
+        shader_group = drawable.shader_group
+        if shader_group is not None:
+            shader_group.shaders = [self.unshare(shader)
+                                    for shader in shader_group.shaders]
+            shader_group.texture_dictionary = [self.unshare(texture)
+                                               for texture in shader_group.texture_dictionary]
+        if drawable.skeleton is not None:
+            drawable.skeleton = self.unshare(drawable.skeleton)
+
+        self._shared.discard(name)
+        return drawable
+
+    @staticmethod
+    def unshare(element):
+        return copy.deepcopy(element) if isinstance(element, SharedElement) else element
 
     def to_xml(self):
         element = ET.Element(self.tag_name)
@@ -603,3 +791,14 @@ class DrawableDictionary(Mapping, Element):
                     f"{type(self).__name__}s can only hold '{Drawable.__name__}' objects, not '{type(drawable)}'!")
 
         return element
+
+    def write(self, writer: XmlWriter):
+        writer.start(self.tag_name)
+        for drawable in self._value.values():
+            if isinstance(drawable, Drawable):
+                drawable.tag_name = "Item"
+                drawable.write(writer)
+            else:
+                raise TypeError(
+                    f"{type(self).__name__}s can only hold '{Drawable.__name__}' objects, not '{type(drawable)}'!")
+        writer.end(self.tag_name)
@@ -0,0 +1,77 @@
+"""Conversion between the blocks of numbers in Codewalker XML text (vertices, indices, colors, animation values...) and numpy arrays"""
+import numpy
+
+
+"""Parse all the numbers in text into a 1D array. Numbers are separated by whitespace and optionally by separator"""
+
+
+def parse_numbers(text: str, dtype=numpy.float64, separator: str = None):
+    if separator:
+        text = text.replace(separator, " ")
+
+    return numpy.fromstring(text, dtype=dtype, sep=" ")
+
+
+"""Parse text with the same amount of numbers on every line into a 2D array with a row per line"""
+
+
+def parse_rows(text: str, dtype=numpy.float64, separator: str = None):
+    text = text.strip()
+    if not text:
+        return numpy.empty((0, 0), dtype=dtype)
+
+    first_line = text.split("\n", 1)[0]
+    if separator:
+        first_line = first_line.replace(separator, " ")
+    columns = len(first_line.split())
+
+    values = parse_numbers(text, dtype, separator)
+    if len(values) % columns != 0:
+        raise ValueError(
+            f"Expected {columns} numbers on every line, got {len(values)} numbers in total!")
+
+    return values.reshape(-1, columns)
+
+
+"""Format numbers to an array of strings, the same way str() formats each of them as a numpy.float32 or an int. Whole
+floats keep their fraction and -0.0 its sign, i.e. 1.0 is written as 1.0"""
+
+
+def format_numbers(values):
+    values = numpy.asarray(values)
+    if values.dtype.kind in "iub":
+        return values.astype(str)
+
+    values = values.astype(numpy.float32)
+    # Formatting is the slow part, so every distinct value is only formatted once. Values are told apart by their bits,
+    # as unique() on the floats would merge -0.0 into 0.0
+    unique, inverse = numpy.unique(
+        values.view(numpy.uint32), return_inverse=True)
+    strings = unique.view(numpy.float32).astype(str)
+
+    return strings[inverse].reshape(values.shape)
+
+
+"""Format a 2D array as text with a line per row"""
+
+
+def format_rows(values, separator: str = " ", line_separator: str = "\n"):
+    return line_separator.join(separator.join(row) for row in format_numbers(values).tolist())
+
+
+"""Format a 1D array as text with a line per columns numbers"""
+
+
+def format_columns(values, columns: int):
+    strings = format_numbers(values)
+    full = len(strings) // columns * columns
+    lines = [" ".join(line)
+             for line in strings[:full].reshape(-1, columns).tolist()]
+    if len(strings) > full:
+        lines.append(" ".join(strings[full:].tolist()))
+    text = " \n".join(lines)
+    # A full last line is also followed by a new line
+    if len(strings) and len(strings) % columns == 0:
+        text += "\n"
+
+    return text
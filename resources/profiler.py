@@ -0,0 +1,205 @@
+"""Opt-in profiler for reading and writing Codewalker XML. Records the time spent and the number of calls
+per resource class (i.e. GeometryItem.from_xml) and per pipeline stage (i.e. parsing the XML file)"""
+import json
+import time
+from contextlib import contextmanager
+
+# Methods of the Element class hierarchy that are timed
+PROFILED_METHODS = ("from_xml", "decode", "to_xml", "write")
+
+
+class ProfileEntry:
+    def __init__(self):
+        self.calls = 0
+        # Time including the time spent in profiled calls made by this one
+        self.total_time = 0.0
+        # Time excluding the time spent in profiled calls made by this one
+        self.self_time = 0.0
+
+    def to_dict(self):
+        return {"calls": self.calls, "total_time": self.total_time, "self_time": self.self_time}
+
+
+class Profiler:
+    def __init__(self):
+        self.enabled = False
+        self.classes = {}
+        self.stages = {}
+        # Time spent in nested profiled calls, one entry per call in progress
+        self._child_times = []
+        # (class, method name, original method) of every patched method
+        self._patched = []
+
+    def reset(self):
+        self.classes = {}
+        self.stages = {}
+        self._child_times = []
+
+    """Start recording. The methods of every subclass of base are wrapped until disable is called,
+    so the profiler costs nothing while it is disabled"""
+
+    def enable(self, base=None):
+        if self.enabled:
+            return
+        if base is None:
+            from .codewalker_xml import Element
+            base = Element
+
+        self.enabled = True
+        for cls in get_subclasses(base):
+            for name in PROFILED_METHODS:
+                if name in cls.__dict__:
+                    self.patch(cls, name)
+
+    def disable(self):
+        for cls, name, method in reversed(self._patched):
+            setattr(cls, name, method)
+        self._patched = []
+        self.enabled = False
+
+    def patch(self, cls, name):
+        method = cls.__dict__[name]
+        # Unwrap classmethods and staticmethods to wrap the function itself
+        wrapper_type = type(method) if isinstance(
+            method, (classmethod, staticmethod)) else None
+        function = method.__func__ if wrapper_type else method
+        if not callable(function):
+            return
+
+        profiler = self
+
+        def profiled(*args, **kwargs):
+            # Record the time under the class it was called on, not the one that defines the method
+            if wrapper_type is staticmethod or not args:
+                owner = cls
+            elif wrapper_type is classmethod:
+                owner = args[0]
+            else:
+                owner = type(args[0])
+            with profiler.measure(profiler.classes, f"{owner.__name__}.{name}"):
+                return function(*args, **kwargs)
+
+        profiled.__name__ = function.__name__
+        profiled.__doc__ = function.__doc__
+        setattr(cls, name, wrapper_type(profiled)
+                if wrapper_type else profiled)
+        self._patched.append((cls, name, method))
+
+    @contextmanager
+    def measure(self, entries, key):
+        start = self.begin()
+        try:
+            yield
+        finally:
+            self.end(entries, key, start)
+
+    """Start timing a call that can't be wrapped in measure(), i.e. an element built over several iterparse events.
+    Every begin must be followed by an end"""
+
+    def begin(self):
+        self._child_times.append(0.0)
+        return time.perf_counter()
+
+    def end(self, entries, key, start):
+        elapsed = time.perf_counter() - start
+        child_time = self._child_times.pop()
+        if self._child_times:
+            self._child_times[-1] += elapsed
+
+        entry = self.get_entry(entries, key)
+        entry.calls += 1
+        entry.total_time += elapsed
+        entry.self_time += elapsed - child_time
+
+    def get_entry(self, entries, key):
+        entry = entries.get(key)
+        if entry is None:
+            entry = entries[key] = ProfileEntry()
+        return entry
+
+    """Time a stage of the pipeline (i.e. 'Build objects'), does nothing while the profiler is disabled.
+    The time spent in the stage named exclude meanwhile is not counted, so nested stages can be told apart"""
+
+    @contextmanager
+    def stage(self, name, exclude=None):
+        if not self.enabled:
+            yield
+            return
+
+        # Stages are not nested in the class timings
+        child_times = self._child_times
+        self._child_times = []
+        excluded_time = self.get_entry(
+            self.stages, exclude).total_time if exclude else 0.0
+        try:
+            with self.measure(self.stages, name):
+                yield
+        finally:
+            self._child_times = child_times
+            if exclude:
+                spent = self.stages[exclude].total_time - excluded_time
+                self.stages[name].total_time -= spent
+                self.stages[name].self_time -= spent
+
+    """Iterate over iterable, adding the time spent getting each item (i.e. the XML parser reading the next event)
+    to the stage name. The time isn't counted in the class timings"""
+
+    def iterate(self, iterable, name):
+        if not self.enabled:
+            return iterable
+        return self.iterate_timed(iter(iterable), self.get_entry(self.stages, name))
+
+    def iterate_timed(self, iterator, entry):
+        entry.calls += 1
+        while True:
+            start = time.perf_counter()
+            item = next(iterator, StopIteration)
+            elapsed = time.perf_counter() - start
+            entry.total_time += elapsed
+            entry.self_time += elapsed
+            if self._child_times:
+                self._child_times[-1] += elapsed
+            if item is StopIteration:
+                return
+            yield item
+
+    """Get the lines of a report of the stages and the classes, ranked by the time spent in them"""
+
+    def report(self, limit=20):
+        lines = ["Stages:"]
+        for name, entry in sorted(self.stages.items(), key=lambda item: item[1].total_time, reverse=True):
+            lines.append(
+                f"  {name}: {entry.total_time:.3f}s ({entry.calls} calls)")
+
+        lines.append("Classes (self time / total time):")
+        ranked = sorted(self.classes.items(),
+                        key=lambda item: item[1].self_time, reverse=True)
+        for name, entry in ranked[:limit]:
+            lines.append(
+                f"  {name}: {entry.self_time:.3f}s / {entry.total_time:.3f}s ({entry.calls} calls)")
+
+        return lines
+
+    def to_dict(self):
+        return {
+            "stages": {name: entry.to_dict() for name, entry in self.stages.items()},
+            "classes": {name: entry.to_dict() for name, entry in self.classes.items()},
+        }
+
+    def write_json(self, filepath):
+        with open(filepath, "w") as file:
+            json.dump(self.to_dict(), file, indent=4)
+
+
+def get_subclasses(cls):
+    subclasses = []
+    pending = [cls]
+    while pending:
+        current = pending.pop()
+        subclasses.append(current)
+        pending.extend(sub for sub in current.__subclasses__()
+                       if sub not in subclasses and sub not in pending)
+    return subclasses
+
+
+profiler = Profiler()
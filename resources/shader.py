@@ -71,7 +71,7 @@ class Shader(ElementTree):
 
 
 class ShaderManager:
-    shaderxml = os.path.join(os.path.dirname(__file__), "shaders.xml")
+    shaderxml = os.path.join(os.path.dirname(__file__), "Shaders.xml")
     shaders = {}
     terrains = ["terrain_cb_w_4lyr.sps", "terrain_cb_w_4lyr_lod.sps", "terrain_cb_w_4lyr_spec.sps", "terrain_cb_w_4lyr_spec_pxm.sps", "terrain_cb_w_4lyr_pxm_spm.sps",
                 "terrain_cb_w_4lyr_pxm.sps", "terrain_cb_w_4lyr_cm_pxm.sps", "terrain_cb_w_4lyr_cm_tnt.sps", "terrain_cb_w_4lyr_cm_pxm_tnt.sps", "terrain_cb_w_4lyr_cm.sps",
@@ -116,8 +116,7 @@ class ShaderManager:
 
     @staticmethod
     def load_shaders():
-        tree = ET.parse(ShaderManager.shaderxml)
-        for node in tree.getroot():
+        for node in parse_xml(ShaderManager.shaderxml):
             shader = Shader.from_xml(node)
             ShaderManager.shaders[shader.name] = shader
 
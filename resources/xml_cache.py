@@ -0,0 +1,178 @@
+"""Binary cache of decoded Codewalker XML files, so importing the same file again doesn't parse it again"""
+import copyreg
+import hashlib
+import os
+import pickle
+import stat
+import sys
+import tempfile
+from mathutils import Vector, Quaternion, Matrix
+
+# Increase whenever the decoded object model changes, entries written by older versions are then never read
+PARSER_VERSION = 5
+
+CACHE_EXTENSION = ".sollumz_cache"
+
+
+# mathutils types can't be pickled on their own, and pickle can't look their classes up by name either,
+# so they are rebuilt by these functions
+def make_vector(values):
+    return Vector(values)
+
+
+def make_quaternion(values):
+    return Quaternion(values)
+
+
+def make_matrix(rows):
+    return Matrix(rows)
+
+
+copyreg.pickle(Vector, lambda vector: (make_vector, (tuple(vector),)))
+copyreg.pickle(Quaternion, lambda quat: (make_quaternion, (tuple(quat),)))
+copyreg.pickle(Matrix, lambda matrix: (
+    make_matrix, (tuple(tuple(row) for row in matrix),)))
+
+
+"""Get the cache folder of the current user. The cache holds pickles, which run code when they are loaded,
+so it must never be in a folder other users can write to like the system temporary folder"""
+
+
+def get_default_cache_directory():
+    if os.name == "nt":
+        base = os.environ.get("LOCALAPPDATA") or tempfile.gettempdir()
+    elif sys.platform == "darwin":
+        base = os.path.expanduser("~/Library/Caches")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser(
+            "~/.cache")
+    return os.path.join(base, "sollumz_cache")
+
+
+"""Whether a file or folder is owned by the current user and other users can't modify it.
+Windows has no owner ids to compare, the folders there are protected by the user's profile"""
+
+
+def is_private(stat_result):
+    if not hasattr(os, "getuid"):
+        return True
+    return stat_result.st_uid == os.getuid() and not stat_result.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+
+
+"""Create cache_directory only accessible by the current user. Returns whether the cache can safely be used in it"""
+
+
+def prepare_cache_directory(cache_directory):
+    try:
+        os.makedirs(cache_directory, mode=0o700, exist_ok=True)
+        stat_result = os.stat(cache_directory)
+    except OSError:
+        return False
+
+    if not stat.S_ISDIR(stat_result.st_mode) or not is_private(stat_result):
+        print(
+            f"Import cache folder '{cache_directory}' can be modified by other users, the import cache is not used.")
+        return False
+
+    return True
+
+
+"""Load a cache entry, refusing symlinks and files other users could have written"""
+
+
+def load_entry(cache_path):
+    fd = os.open(cache_path, os.O_RDONLY | getattr(os, "O_NOFOLLOW", 0) |
+                 getattr(os, "O_BINARY", 0))
+    with os.fdopen(fd, "rb") as file:
+        stat_result = os.fstat(file.fileno())
+        if not stat.S_ISREG(stat_result.st_mode) or not is_private(stat_result):
+            raise ValueError(f"Untrusted cache entry '{cache_path}'!")
+        return pickle.load(file)
+
+
+"""Get the path of the cache entry of filepath. The entry changes whenever the file is modified"""
+
+
+def get_cache_path(filepath, cache_directory):
+    stat = os.stat(filepath)
+    key = f"{os.path.abspath(filepath)}|{stat.st_mtime_ns}|{stat.st_size}|{PARSER_VERSION}"
+    return os.path.join(cache_directory, hashlib.sha1(key.encode()).hexdigest() + CACHE_EXTENSION)
+
+
+def get_cache_entries(cache_directory):
+    if not os.path.isdir(cache_directory):
+        return []
+
+    return [entry for entry in os.scandir(cache_directory) if entry.is_file() and entry.name.endswith(CACHE_EXTENSION)]
+
+
+"""Read filepath with read (i.e. YDR.from_xml_file), or load the object model decoded by a previous read from
+cache_directory. The least recently used entries are removed once the cache grows over size_budget bytes."""
+
+
+def read_cached(filepath, read, cache_directory, size_budget):
+    if not prepare_cache_directory(cache_directory):
+        return read(filepath)
+
+    cache_path = get_cache_path(filepath, cache_directory)
+
+    if os.path.lexists(cache_path):
+        try:
+            result = load_entry(cache_path)
+            # Mark as recently used
+            os.utime(cache_path)
+            return result
+        except Exception:
+            # Unreadable entry, i.e. written by an incompatible version of a dependency
+            remove_entry(cache_path)
+
+    result = read(filepath)
+
+    temp_path = None
+    try:
+        # mkstemp creates the file only readable and writable by the current user
+        fd, temp_path = tempfile.mkstemp(suffix=".tmp", dir=cache_directory)
+        with os.fdopen(fd, "wb") as file:
+            pickle.dump(result, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, cache_path)
+        evict(cache_directory, size_budget)
+    except Exception:
+        # Caching is only an optimization, the import itself succeeded
+        if temp_path:
+            remove_entry(temp_path)
+
+    return result
+
+
+"""Remove the least recently used entries until the cache is no larger than size_budget bytes"""
+
+
+def evict(cache_directory, size_budget):
+    entries = sorted(get_cache_entries(cache_directory),
+                     key=lambda entry: entry.stat().st_mtime)
+    total_size = sum(entry.stat().st_size for entry in entries)
+
+    for entry in entries:
+        if total_size <= size_budget:
+            break
+        total_size -= entry.stat().st_size
+        remove_entry(entry.path)
+
+
+"""Remove all entries from the cache, returns the number of bytes freed"""
+
+
+def clear_cache(cache_directory):
+    freed = 0
+    for entry in get_cache_entries(cache_directory):
+        freed += entry.stat().st_size
+        remove_entry(entry.path)
+
+    return freed
+
+
+def remove_entry(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
@@ -1,7 +1,10 @@
+import bpy
 import traceback
 import time
 from abc import abstractmethod
 from .sollumz_properties import SollumType
+from .tools.blenderhelper import get_addon_preferences
+from .resources.profiler import profiler
 
 
 class SOLLUMZ_OT_base:
@@ -17,9 +20,17 @@ class SOLLUMZ_OT_base:
         pass
 
     def execute(self, context):
+        preferences = get_addon_preferences(context)
+        # Only operators reporting their time (imports and exports) are profiled
+        profile = preferences.profile_operators and self.bl_showtime
+        if profile:
+            profiler.reset()
+            profiler.enable()
+
         start = time.time()
         try:
-            result = self.run(context)
+            with profiler.stage(self.bl_label):
+                result = self.run(context)
             reset_sollumz_view(context.scene)
         except:
             result = False
@@ -27,6 +38,10 @@ class SOLLUMZ_OT_base:
                 f"Error occured running operator : {self.bl_idname} \n {traceback.format_exc()}")
         end = time.time()
 
+        if profile:
+            profiler.disable()
+            self.report_profile(preferences.profile_report_path)
+
         if self.bl_showtime and result == True:
             self.message(
                 f"{self.bl_label} took {round(end - start, 3)} seconds to {self.bl_action}.")
@@ -39,6 +54,16 @@ class SOLLUMZ_OT_base:
         else:
             return {"CANCELLED"}
 
+    def report_profile(self, filepath):
+        self.messages.extend(profiler.report())
+        if filepath:
+            filepath = bpy.path.abspath(filepath)
+            try:
+                profiler.write_json(filepath)
+                self.messages.append(f"Profile written to {filepath}")
+            except OSError as e:
+                self.messages.append(f"Failed to write profile: {e}")
+
     def message(self, msg):
         self.report({"INFO"}, msg)
 
@@ -5,8 +5,8 @@ from abc import abstractmethod
 import bpy
 from enum import Enum
 from .sollumz_helper import *
-from .sollumz_properties import SollumType, SOLLUMZ_UI_NAMES, BOUND_TYPES
-from .resources.drawable import YDR, YDD
+from .sollumz_properties import SollumType, SOLLUMZ_UI_NAMES, BOUND_TYPES, LODLevel
+from .resources.drawable import YDR, YDD, DrawableDictionary
 from .resources.fragment import YFT
 from .resources.bound import YBN
 from .ydr.ydrimport import import_ydr
@@ -20,7 +20,8 @@ from .ybn.ybnexport import export_ybn
 from .resources.ymap import YMAP, EntityItem, CMapData
 from .tools.meshhelper import *
 from .tools.utils import *
-from .tools.blenderhelper import get_terrain_texture_brush
+from .tools.blenderhelper import get_terrain_texture_brush, get_addon_preferences, get_import_cache_directory
+from .resources.xml_cache import clear_cache
 from bpy_extras.io_utils import ImportHelper, ExportHelper
 
 
@@ -52,14 +53,33 @@ class SOLLUMZ_OT_import(SOLLUMZ_OT_base, bpy.types.Operator, ImportHelper):
         default=True,
     )
 
+    drawable_selection: bpy.props.StringProperty(
+        name="Drawables",
+        description="Comma separated names of the drawables to import from drawable dictionaries, or their hashes written as 0x hexadecimal. Names are not case sensitive. All drawables are imported if empty",
+        default="",
+    )
+
+    import_lods: bpy.props.EnumProperty(
+        name="LODs",
+        description="LOD levels of drawables to import, models of the other levels are skipped",
+        items=((LODLevel.HIGH.value, "High", "Import the high LOD"),
+               (LODLevel.MEDIUM.value, "Medium", "Import the medium LOD"),
+               (LODLevel.LOW.value, "Low", "Import the low LOD"),
+               (LODLevel.VERYLOW.value, "Very Low", "Import the very low LOD")),
+        options={"ENUM_FLAG"},
+        default={LODLevel.HIGH.value, LODLevel.MEDIUM.value,
+                 LODLevel.LOW.value, LODLevel.VERYLOW.value},
+    )
+
     def import_file(self, filepath, ext):
         try:
             valid_type = False
             if ext == YDR.file_extension:
-                import_ydr(filepath, self.join_geometries)
+                import_ydr(filepath, self.join_geometries, self.import_lods)
                 valid_type = True
             elif ext == YDD.file_extension:
-                import_ydd(filepath, self.join_geometries)
+                import_ydd(filepath, self.join_geometries,
+                           DrawableDictionary.parse_selection(self.drawable_selection), self.import_lods)
                 valid_type = True
             elif ext == YFT.file_extension:
                 import_yft(filepath)
@@ -96,6 +116,20 @@ class SOLLUMZ_OT_import(SOLLUMZ_OT_base, bpy.types.Operator, ImportHelper):
         return True
 
 
+class SOLLUMZ_OT_clear_import_cache(SOLLUMZ_OT_base, bpy.types.Operator):
+    """Remove all files from the import cache"""
+    bl_idname = "sollumz.clear_import_cache"
+    bl_label = "Clear Import Cache"
+    bl_action = bl_label
+
+    def run(self, context):
+        freed = clear_cache(get_import_cache_directory(
+            get_addon_preferences(context)))
+        self.message(
+            f"Removed {round(freed / (1024 * 1024), 2)} MB from the import cache.")
+        return True
+
+
 class ExportSettings(bpy.types.PropertyGroup):
     local: bpy.props.BoolProperty(
         name="Export drawables local to position")
@@ -0,0 +1,61 @@
+"""Reading large synthetic YDR, YBN and YCD files with the lxml and the ElementTree backend, and writing them back"""
+import os
+import tempfile
+
+from benchmark import main, best_time
+import synthetic
+
+
+def run(results, args):
+    from sollumz.resources import codewalker_xml
+    from sollumz.resources.drawable import YDR
+    from sollumz.resources.bound import YBN
+    from sollumz.resources.clipsdictionary import YCD
+
+    lxml_etree = getattr(codewalker_xml, "lxml_etree", None)
+    backends = [("ElementTree", None)]
+    if lxml_etree is not None:
+        backends.insert(0, ("lxml", lxml_etree))
+
+    scale = args.scale
+    with tempfile.TemporaryDirectory() as directory:
+        files = [
+            (YDR, os.path.join(directory, "synthetic.ydr.xml"),
+             lambda filepath: synthetic.write_drawable(filepath, 40 * scale, 3000, 20)),
+            (YBN, os.path.join(directory, "synthetic.ybn.xml"),
+             lambda filepath: synthetic.write_bounds(filepath, 1000 * scale, 200)),
+            (YCD, os.path.join(directory, "synthetic.ycd.xml"),
+             lambda filepath: synthetic.write_clips(filepath, 2000 * scale, 600)),
+        ]
+
+        for facade, filepath, write in files:
+            write(filepath)
+            megabytes = os.path.getsize(filepath) / 1024 ** 2
+            name = os.path.basename(filepath)
+
+            for backend, module in backends:
+                codewalker_xml.lxml_etree = module
+                if hasattr(codewalker_xml, "iterparse_xml"):
+                    results.add(f"Tokenize {name} ({backend})", best_time(
+                        lambda: sum(1 for _ in codewalker_xml.iterparse_xml(filepath, ("start", "end"))), args.repeat),
+                        megabytes, "MB")
+                results.add(f"Read {name} ({backend})", best_time(
+                    lambda: facade.from_xml_file(filepath), args.repeat), megabytes, "MB")
+            codewalker_xml.lxml_etree = lxml_etree
+
+            # Writing doesn't depend on the backend
+            decoded = facade.from_xml_file(filepath)
+            output = os.path.join(directory, "written.xml")
+            results.add(f"Write {name}", best_time(
+                lambda: facade.write_xml(decoded, output), args.repeat), megabytes, "MB")
+
+
+def add_arguments(parser):
+    parser.add_argument("--scale", type=int, default=1,
+                        help="Multiply the size of the files")
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="Number of times each file is read, the fastest is reported")
+
+
+if __name__ == "__main__":
+    main(run, add_arguments)
@@ -0,0 +1,74 @@
+"""Memory held by a decoded drawable dictionary, with and without sharing the identical shaders, textures and
+skeletons of its drawables, and the time to decode it. Measure a real dictionary, i.e. a ped's, with --file:
+
+    python tests/benchmarks/bench_drawable_dictionary.py --file ped.ydd.xml --compare 42b7532~1
+
+Without --file, a synthetic dictionary whose drawables hold the same skeleton is measured"""
+import gc
+import os
+import tempfile
+import tracemalloc
+
+from benchmark import main, best_time
+import synthetic
+
+
+"""Get the bytes allocated by read(filepath) that are still held by its result"""
+
+
+def measure_size(read, filepath):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = read(filepath)
+        gc.collect()
+        size = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    del result
+    return size
+
+
+def run(results, args):
+    from sollumz.resources.drawable import YDD, DrawableDictionary
+
+    with tempfile.TemporaryDirectory() as directory:
+        filepath = args.file
+        if filepath is None:
+            filepath = os.path.join(directory, "synthetic.ydd.xml")
+            synthetic.write_drawable_dictionary(
+                filepath, args.drawables, 4, 200, bones=args.bones)
+        megabytes = os.path.getsize(filepath) / 1024 ** 2
+
+        results.add("Decode", best_time(lambda: YDD.from_xml_file(
+            filepath), args.repeat), megabytes, "MB")
+        results.add_size("Decoded dictionary",
+                         measure_size(YDD.from_xml_file, filepath))
+
+        share = getattr(DrawableDictionary, "share", None)
+        if share is not None:
+            # The same decoding with every drawable keeping its own elements
+            DrawableDictionary.share = lambda self, drawable: None
+            try:
+                results.add("Decode without sharing", best_time(
+                    lambda: YDD.from_xml_file(filepath), args.repeat), megabytes, "MB")
+                results.add_size("Decoded dictionary without sharing",
+                                 measure_size(YDD.from_xml_file, filepath))
+            finally:
+                DrawableDictionary.share = share
+
+
+def add_arguments(parser):
+    parser.add_argument(
+        "--file", help="Codewalker XML drawable dictionary to measure")
+    parser.add_argument("--drawables", type=int, default=40,
+                        help="Number of drawables of the synthetic dictionary")
+    parser.add_argument("--bones", type=int, default=100,
+                        help="Number of bones of the skeleton the synthetic drawables hold")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="Number of times the dictionary is decoded, the fastest is reported")
+
+
+if __name__ == "__main__":
+    main(run, add_arguments)
@@ -0,0 +1,42 @@
+"""Field access and construction of ElementTree objects, i.e. the light fields read by light_to_obj"""
+from benchmark import main, best_time
+
+
+def run(results, args):
+    from sollumz.resources.drawable import LightItem, GeometryItem, ShaderItem
+
+    lights = [LightItem() for _ in range(args.objects)]
+    names = list(vars(lights[0]))
+    accesses = len(lights) * len(names)
+
+    def read_fields():
+        for light in lights:
+            for name in names:
+                getattr(light, name)
+
+    def write_fields():
+        for light in lights:
+            for name in names:
+                setattr(light, name, None)
+
+    def get_elements():
+        for light in lights:
+            for name in names:
+                light.get_element(name)
+
+    results.add("Read a field", best_time(read_fields), accesses, "reads")
+    results.add("Get a field's element", best_time(get_elements), accesses, "calls")
+    results.add("Set a field", best_time(write_fields), accesses, "writes")
+
+    for element_type in (LightItem, GeometryItem, ShaderItem):
+        results.add(f"Construct {element_type.__name__}",
+                    best_time(lambda: [element_type() for _ in range(args.objects)]), args.objects, "objects")
+
+
+def add_arguments(parser):
+    parser.add_argument("--objects", type=int, default=2000,
+                        help="Number of objects to access and construct")
+
+
+if __name__ == "__main__":
+    main(run, add_arguments)
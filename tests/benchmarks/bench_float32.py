@@ -0,0 +1,69 @@
+"""Rounding the positions, normals, tangents and UVs of every loop of a mesh to float32 for export, like
+get_mesh_buffers does. Revisions with float32_list round every loop on its own, later ones round whole arrays with
+float32_array and transform_points. Blender isn't needed, the mesh is made of mathutils values and arrays"""
+import random
+
+from benchmark import main, best_time
+
+
+def run(results, args):
+    import numpy
+    from mathutils import Matrix, Vector
+    from sollumz.tools import utils
+
+    generator = random.Random(0)
+    loops = args.loops
+    vertex_count = loops // 4
+    matrix = Matrix.Translation((1, 2, 3)) @ Matrix.Rotation(0.5, 4, "Z")
+    positions = numpy.array([[generator.uniform(-10, 10) for _ in range(3)]
+                             for _ in range(vertex_count)], dtype=numpy.float32)
+    vertex_indices = numpy.array([generator.randrange(vertex_count)
+                                  for _ in range(loops)], dtype=numpy.int32)
+    normals = numpy.array([[generator.uniform(-1, 1) for _ in range(3)]
+                           for _ in range(loops)], dtype=numpy.float32)
+    tangents = numpy.array([[generator.uniform(-1, 1) for _ in range(3)] + [generator.choice((-1, 1))]
+                            for _ in range(loops)], dtype=numpy.float32)
+    uvs = numpy.array([[generator.uniform(0, 1) for _ in range(2)]
+                       for _ in range(loops)], dtype=numpy.float32)
+
+    if hasattr(utils, "float32_list"):
+        # The Blender collections give one mathutils value per item
+        float32_list = utils.float32_list
+        vertex_cos = [Vector(co) for co in positions.tolist()]
+        loop_data = list(zip(vertex_indices.tolist(), [Vector(normal) for normal in normals.tolist()],
+                             [Vector(tangent[:3]) for tangent in tangents.tolist()], tangents[:, 3].tolist(),
+                             [Vector(uv) for uv in uvs.tolist()]))
+
+        def round_loops():
+            for vertex_index, normal, tangent, bitangent_sign, uv in loop_data:
+                tuple(float32_list(matrix @ vertex_cos[vertex_index]))
+                tuple(float32_list(normal))
+                rounded = float32_list(tangent.to_4d())
+                rounded[3] = bitangent_sign
+                tuple(rounded)
+                # flip_uv()
+                tuple(float32_list([uv[0], (uv[1] - 1.0) * -1]))
+    else:
+        float32_array, transform_points = utils.float32_array, utils.transform_points
+
+        def round_loops():
+            float32_array(transform_points(positions, matrix))[vertex_indices]
+            float32_array(normals)
+            float32_array(tangents)
+            flipped = uvs.astype(numpy.float64)
+            flipped[:, 1] = (flipped[:, 1] - 1.0) * -1
+            float32_array(flipped)
+
+    results.add("Round loops to float32", best_time(
+        round_loops, args.repeat), loops, "loops")
+
+
+def add_arguments(parser):
+    parser.add_argument("--loops", type=int, default=1000000,
+                        help="Number of loops of the mesh")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="Number of times the loops are rounded, the fastest is reported")
+
+
+if __name__ == "__main__":
+    main(run, add_arguments)
@@ -0,0 +1,93 @@
+"""Creating the uv and vertex colour layers of an imported mesh with create_uv_layer and create_vertexcolor_layer. The
+per loop versions before they set the layers in one call are copied here, as ydr.ydrimport of those revisions can't be
+imported on case sensitive file systems, and are measured next to the functions of the measured revision. Needs bpy"""
+from benchmark import main, best_time
+
+
+def divide_list(list, d):
+    result = []
+    for item in list:
+        answer = item / d
+        result.append(answer)
+    return result
+
+
+def flip_uv(uv):
+    u = uv[0]
+    v = (uv[1] - 1.0) * -1
+    return [u, v]
+
+
+def create_uv_layer_per_loop(mesh, num, name, texcoords):
+    mesh.uv_layers.new()
+    uv_layer = mesh.uv_layers[num]
+    uv_layer.name = name
+    for i in range(len(uv_layer.data)):
+        uv = flip_uv(texcoords[mesh.loops[i].vertex_index])
+        uv_layer.data[i].uv = uv
+
+
+def create_vertexcolor_layer_per_loop(mesh, num, name, colors):
+    mesh.vertex_colors.new(name="Vertex Colors " + str(num))
+    color_layer = mesh.vertex_colors[num]
+    color_layer.name = name
+    for i in range(len(color_layer.data)):
+        rgba = colors[mesh.loops[i].vertex_index]
+        color_layer.data[i].color = divide_list(rgba, 255)
+
+
+def run(results, args):
+    import bpy
+    import numpy
+    from sollumz.ydr.ydrimport import create_uv_layer, create_vertexcolor_layer
+    from sollumz.tools.meshhelper import create_mesh_from_triangles, get_attribute_array
+
+    generator = numpy.random.default_rng(0)
+    vertex_count = args.vertices
+    positions = generator.uniform(-10, 10, (vertex_count, 3))
+    indices = generator.integers(0, vertex_count, vertex_count * 2 // 3 * 3)
+    loops = len(indices)
+    # Vertex buffers read texcoords as float32 and colours as uint8
+    texcoords = generator.uniform(0, 1, (vertex_count, 2)).astype(numpy.float32)
+    colors = generator.integers(0, 256, (vertex_count, 4), dtype=numpy.uint8)
+
+    def new_mesh():
+        return create_mesh_from_triangles("benchmark", positions, indices)
+
+    def measure(name, create_layer, *layer_args):
+        meshes = []
+
+        def create():
+            mesh = new_mesh()
+            meshes.append(mesh)
+            create_layer(mesh, 0, name, *layer_args)
+
+        mesh_seconds = best_time(new_mesh, args.repeat)
+        results.add(name, best_time(create, args.repeat) -
+                    mesh_seconds, loops, "loops")
+        for mesh in meshes:
+            bpy.data.meshes.remove(mesh)
+
+    def with_loop_vertex_indices(create_layer):
+        def create(mesh, num, name, values):
+            create_layer(mesh, num, name, values, get_attribute_array(
+                mesh.loops, "vertex_index", dtype=numpy.int32))
+        return create
+
+    measure("UV layer per loop", create_uv_layer_per_loop, texcoords)
+    measure("UV layer", with_loop_vertex_indices(create_uv_layer), texcoords)
+    measure("Colour layer per loop",
+            create_vertexcolor_layer_per_loop, colors)
+    measure("Colour layer", with_loop_vertex_indices(
+        create_vertexcolor_layer), colors)
+
+
+def add_arguments(parser):
+    parser.add_argument("--vertices", type=int, default=100000,
+                        help="Number of vertices of the mesh, it has about twice as many loops")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="Number of times the layers are created, the fastest is reported")
+
+
+if __name__ == "__main__":
+    main(run, add_arguments)
@@ -0,0 +1,80 @@
+"""Throughput of the numeric text codec, and of the properties reading and writing blocks of numbers with it: index
+data, bound vertices and vertex colours, and animation values"""
+import random
+from xml.etree import ElementTree as ET
+
+from benchmark import main, best_time
+
+
+def make_element(tag, text):
+    element = ET.Element(tag)
+    element.text = text
+    return element
+
+
+def run(results, args):
+    from sollumz.resources.drawable import IndexDataProperty
+    from sollumz.resources.bound import VerticesProperty, VertexColorProperty
+    from sollumz.resources.clipsdictionary import ValuesBuffer
+
+    generator = random.Random(0)
+    count = args.numbers - args.numbers % 12
+    floats = [round(generator.uniform(-100, 100), generator.choice([0, 2, 6]))
+              for _ in range(count)]
+    integers = [generator.randrange(65536) for _ in range(count)]
+    float_text = "\n".join(" ".join(map(str, floats[start:start + 10]))
+                           for start in range(0, count, 10))
+    integer_text = "\n".join(" ".join(map(str, integers[start:start + 24]))
+                             for start in range(0, count, 24))
+    vertex_text = "\n" + "\n".join(", ".join(map(str, floats[start:start + 3]))
+                                   for start in range(0, count, 3)) + "\n"
+    color_text = "\n" + "\n".join(", ".join(str(value % 256) for value in integers[start:start + 4])
+                                  for start in range(0, count, 4)) + "\n"
+
+    try:
+        import numpy
+        from sollumz.resources.numeric_text import parse_numbers, parse_rows, format_numbers, format_columns
+    except ImportError:
+        # Revisions before the codec only have the properties
+        pass
+    else:
+        float_array = numpy.array(floats, dtype=numpy.float32)
+        integer_array = numpy.array(integers, dtype=numpy.uint16)
+        results.add("parse_numbers floats", best_time(
+            lambda: parse_numbers(float_text)), count, "numbers")
+        results.add("parse_numbers integers", best_time(
+            lambda: parse_numbers(integer_text, numpy.uint32)), count, "numbers")
+        results.add("parse_rows", best_time(
+            lambda: parse_rows(vertex_text, separator=",")), count, "numbers")
+        results.add("format_numbers floats", best_time(
+            lambda: format_numbers(float_array)), count, "numbers")
+        results.add("format_columns integers", best_time(
+            lambda: format_columns(integer_array, 24)), count, "numbers")
+
+    # The lazy properties only decode when their value is accessed
+    properties = [
+        ("index data", IndexDataProperty,
+         make_element("Data", integer_text)),
+        ("animation values", ValuesBuffer,
+         make_element("Values", float_text)),
+        ("bound vertices", VerticesProperty,
+         make_element("Vertices", vertex_text)),
+        ("bound vertex colours", VertexColorProperty,
+         make_element("VertexColours", color_text)),
+    ]
+    for name, prop_type, element in properties:
+        results.add(f"Read {name}", best_time(
+            lambda: prop_type.from_xml(element).value), count, "numbers")
+        prop = prop_type.from_xml(element)
+        prop.value
+        results.add(f"Write {name}", best_time(
+            prop.to_xml), count, "numbers")
+
+
+def add_arguments(parser):
+    parser.add_argument("--numbers", type=int, default=100000,
+                        help="Number of numbers in each block of text")
+
+
+if __name__ == "__main__":
+    main(run, add_arguments)
@@ -0,0 +1,144 @@
+"""Shared setup of the benchmarks. A benchmark measures the working tree, or another revision of the addon with
+--revision. --compare measures both and prints them side by side, which is how a change is compared with the code
+before it:
+
+    python tests/benchmarks/bench_element_access.py
+    python tests/benchmarks/bench_element_access.py --compare 8108a85
+"""
+import argparse
+import atexit
+import io
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tarfile
+import tempfile
+import timeit
+import types
+
+ROOT = os.path.dirname(os.path.dirname(
+    os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    # The bpy module (pip install bpy) makes mathutils importable outside of Blender
+    import bpy
+except ImportError:
+    pass
+
+
+"""Register the addon at revision, or the working tree if None, as the sollumz package without running its __init__"""
+
+
+def load_package(revision=None):
+    path = ROOT
+    if revision is not None:
+        path = tempfile.mkdtemp(prefix="sollumz_benchmark_")
+        atexit.register(shutil.rmtree, path, True)
+        archive = subprocess.run(["git", "archive", revision], cwd=ROOT,
+                                 check=True, stdout=subprocess.PIPE).stdout
+        with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+            tar.extractall(path)
+
+    package = types.ModuleType("sollumz")
+    package.__path__ = [path]
+    sys.modules["sollumz"] = package
+
+
+"""Seconds of the fastest of repeat calls of func"""
+
+
+def best_time(func, repeat=5):
+    return min(timeit.repeat(func, number=1, repeat=repeat))
+
+
+class Results:
+    """Timings of one run, name -> (seconds per call, items handled per call, item unit), and memory sizes in bytes"""
+
+    def __init__(self):
+        self.timings = {}
+        self.sizes = {}
+
+    def add(self, name, seconds, count=1, unit="calls"):
+        self.timings[name] = (seconds, count, unit)
+
+    def add_size(self, name, size):
+        self.sizes[name] = size
+
+
+def format_timing(seconds, count, unit):
+    return f"{seconds * 1000:10.3f} ms {count / seconds:14,.0f} {unit}/s"
+
+
+def format_size(size):
+    return f"{size / 1024 ** 2:10.2f} MB"
+
+
+def print_results(results):
+    width = max(map(len, list(results.timings) + list(results.sizes)), default=0)
+    for name, (seconds, count, unit) in results.timings.items():
+        print(f"{name:<{width}}  {format_timing(seconds, count, unit)}")
+    for name, size in results.sizes.items():
+        print(f"{name:<{width}}  {format_size(size)}")
+
+
+def print_comparison(before, after, revision):
+    width = max(map(len, list(after.timings) + list(after.sizes)), default=0)
+    print(f"{'':<{width}}  {revision:>42}  {'working tree':>42}")
+    for name, (seconds, count, unit) in after.timings.items():
+        if name in before.timings:
+            old_seconds, old_count, old_unit = before.timings[name]
+            print(f"{name:<{width}}  {format_timing(old_seconds, old_count, old_unit)}  "
+                  f"{format_timing(seconds, count, unit)}  {old_seconds / seconds:6.2f}x")
+        else:
+            print(f"{name:<{width}}  {'not available':>42}  {format_timing(seconds, count, unit)}")
+    for name, size in after.sizes.items():
+        if name in before.sizes:
+            old_size = before.sizes[name]
+            print(f"{name:<{width}}  {format_size(old_size):>42}  {format_size(size):>42}  "
+                  f"{old_size / size:6.2f}x")
+        else:
+            print(f"{name:<{width}}  {'not available':>42}  {format_size(size):>42}")
+
+
+"""Run a benchmark script. run(results, args) imports what it measures from the sollumz package and adds its timings.
+add_arguments(parser), if given, adds the options of the benchmark, which are passed on to the compared revision"""
+
+
+def main(run, add_arguments=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--revision", help="Measure this git revision instead of the working tree")
+    parser.add_argument("--compare", metavar="REVISION",
+                        help="Also measure this git revision and compare it with the working tree")
+    parser.add_argument("--json", action="store_true", help=argparse.SUPPRESS)
+    if add_arguments is not None:
+        add_arguments(parser)
+    args, passed = parser.parse_known_args()
+    if passed:
+        parser.error(f"unrecognized arguments: {' '.join(passed)}")
+
+    before = None
+    if args.compare:
+        forwarded = [arg for arg in sys.argv[1:]
+                     if arg not in ("--compare", args.compare)]
+        output = subprocess.run([sys.executable, sys.argv[0], "--revision", args.compare, "--json"] + forwarded,
+                                check=True, stdout=subprocess.PIPE, text=True).stdout
+        before = Results()
+        output = json.loads(output)
+        for name, timing in output["timings"].items():
+            before.add(name, *timing)
+        for name, size in output["sizes"].items():
+            before.add_size(name, size)
+
+    load_package(args.revision)
+    results = Results()
+    run(results, args)
+
+    if args.json:
+        json.dump({"timings": results.timings,
+                  "sizes": results.sizes}, sys.stdout)
+    elif before is not None:
+        print_comparison(before, results, args.compare)
+    else:
+        print_results(results)
@@ -0,0 +1,265 @@
+"""Large synthetic Codewalker XML files for the benchmarks, written in the same layout as the files in tests/data"""
+import random
+
+HEADER = '<?xml version="1.0" encoding="UTF-8"?>\n'
+
+
+class Generator:
+    def __init__(self, seed=0):
+        self.random = random.Random(seed)
+
+    def number(self):
+        return repr(round(self.random.uniform(-10, 10), self.random.choice([0, 1, 3, 6])))
+
+    def byte(self):
+        return str(self.random.randint(0, 255))
+
+    def vector(self, tag, size=3):
+        return f'<{tag} ' + " ".join(f'{axis}="{self.number()}"' for axis in "xyzw"[:size]) + ' />'
+
+    @staticmethod
+    def value(tag, value):
+        return f'<{tag} value="{value}" />'
+
+    def vertex(self, layout):
+        items = []
+        for semantic in layout:
+            if semantic in ("Position", "Normal"):
+                items.append(" ".join(self.number() for _ in range(3)))
+            elif semantic.startswith(("Colour", "Blend")):
+                items.append(" ".join(self.byte() for _ in range(4)))
+            elif semantic.startswith("TexCoord"):
+                items.append(" ".join(self.number() for _ in range(2)))
+            elif semantic == "Tangent":
+                items.append(" ".join(self.number() for _ in range(4)))
+        return "   ".join(items)
+
+    def geometry(self, vertices, layout):
+        data = "\n".join(self.vertex(layout) for _ in range(vertices))
+        indices = [str(self.random.randrange(vertices))
+                   for _ in range(vertices * 3)]
+        index_data = "\n".join(" ".join(indices[start:start + 24])
+                               for start in range(0, len(indices), 24))
+        return f"""<Item>
+{self.value('ShaderIndex', 0)}
+{self.vector('BoundingBoxMin')}
+{self.vector('BoundingBoxMax')}
+<VertexBuffer>
+{self.value('Flags', 0)}
+<Layout type="GTAV1">{''.join(f'<{semantic} />' for semantic in layout)}</Layout>
+<Data>
+{data}
+</Data>
+</VertexBuffer>
+<IndexBuffer>
+<Data>
+{index_data}
+</Data>
+</IndexBuffer>
+</Item>"""
+
+    def bound_fields(self):
+        vectors = [self.vector(tag) for tag in (
+            "BoxMin", "BoxMax", "BoxCenter", "SphereCenter")]
+        values = [self.value("SphereRadius", self.number()), self.value("Margin", "0.04"),
+                  self.value("Volume", self.number()), self.vector("Inertia")]
+        values += [self.value(tag, value) for tag, value in (
+            ("MaterialIndex", 3), ("MaterialColourIndex", 0), ("ProceduralID", 0), ("RoomID", 0), ("PedDensity", 0),
+            ("UnkFlags", 0), ("PolyFlags", 0), ("UnkType", 1))]
+        return "\n".join(vectors + values)
+
+    def composite_fields(self):
+        return "\n".join([self.vector("CompositePosition"), self.vector("CompositeRotation", 4),
+                          self.vector("CompositeScale"),
+                          "<CompositeFlags1>MAP_WEAPON, MAP_DYNAMIC</CompositeFlags1>",
+                          "<CompositeFlags2>VEHICLE_BVH</CompositeFlags2>"])
+
+    def geometry_bound(self, vertices):
+        polygons = "\n".join(
+            f'<Triangle m="0" v1="{self.random.randrange(vertices)}" v2="{self.random.randrange(vertices)}" '
+            f'v3="{self.random.randrange(vertices)}" f1="0" f2="1" f3="2" />' for _ in range(vertices))
+        return f'''<Item type="GeometryBVH">
+{self.bound_fields()}
+{self.composite_fields()}
+{self.vector('GeometryCenter')}
+<Materials>
+<Item>{self.value('Type', 12)}{self.value('ProceduralID', 0)}{self.value('RoomID', 0)}{self.value('PedDensity', 0)}<Flags>FLAG_STAIRS</Flags>{self.value('MaterialColourIndex', 0)}{self.value('Unk', 0)}</Item>
+</Materials>
+<Vertices>
+{chr(10).join(", ".join(self.number() for _ in range(3)) for _ in range(vertices))}
+</Vertices>
+<VertexColours>
+{chr(10).join(", ".join(self.byte() for _ in range(4)) for _ in range(vertices))}
+</VertexColours>
+<Polygons>
+{polygons}
+</Polygons>
+</Item>'''
+
+    def composite(self, children, vertices):
+        items = []
+        for index in range(children):
+            if index % 2:
+                items.append(self.geometry_bound(vertices))
+            else:
+                items.append(
+                    f'<Item type="Box">\n{self.bound_fields()}\n{self.composite_fields()}\n</Item>')
+        return f'<Bounds type="Composite">\n{self.bound_fields()}\n<Children>\n' + "\n".join(items) + '\n</Children>\n</Bounds>'
+
+    def shader_group(self, name):
+        return f"""<ShaderGroup>
+{self.value('Unknown30', 8)}
+<TextureDictionary>
+<Item><Name>tex_{name}</Name>{self.value('Unk32', 128)}<Usage>DEFAULT</Usage><UsageFlags>NOT_HALF, X2</UsageFlags>{self.value('ExtraFlags', 0)}{self.value('Width', 512)}{self.value('Height', 256)}{self.value('MipLevels', 10)}<Format>D3DFMT_DXT1</Format><FileName>tex_{name}.dds</FileName></Item>
+</TextureDictionary>
+<Shaders>
+<Item>
+<Name>normal_spec</Name>
+<FileName>normal_spec.sps</FileName>
+{self.value('RenderBucket', 0)}
+<Parameters>
+<Item name="DiffuseSampler" type="Texture"><Name>tex_{name}</Name></Item>
+<Item name="BumpSampler" type="Texture"><Name>shared_n</Name></Item>
+<Item name="matMaterialColorScale" type="Vector" x="1" y="0" z="0.5" w="1" />
+</Parameters>
+</Item>
+</Shaders>
+</ShaderGroup>"""
+
+    def skeleton(self, bones):
+        items = "\n".join(
+            f"<Item><Name>bone{index}</Name>{self.value('Tag', index * 100)}{self.value('Index', index)}"
+            f"{self.value('ParentIndex', index - 1)}{self.value('SiblingIndex', -1)}<Flags>RotX, RotY</Flags>"
+            f"{self.vector('Translation')}{self.vector('Rotation', 4)}{self.vector('Scale')}{self.vector('TransformUnk', 4)}</Item>"
+            for index in range(bones))
+        return f"""<Skeleton>
+{self.value('Unknown1C', 16777216)}{self.value('Unknown50', 567032952)}{self.value('Unknown54', 2134582703)}{self.value('Unknown58', 2503907467)}
+<Bones>
+{items}
+</Bones>
+</Skeleton>"""
+
+    def models(self, tag, geometries, vertices):
+        layouts = [["Position", "Normal", "Colour0", "TexCoord0"],
+                   ["Position", "BlendWeights", "BlendIndices", "Normal", "Colour0", "Colour1", "TexCoord0", "TexCoord1",
+                    "Tangent"]]
+        items = "\n".join(self.geometry(vertices, layouts[index % 2])
+                          for index in range(geometries))
+        return f"""<{tag}>
+<Item>
+{self.value('RenderMask', 255)}{self.value('Flags', 0)}{self.value('HasSkin', 1)}{self.value('BoneIndex', 0)}{self.value('Unknown1', 4)}
+<Geometries>
+{items}
+</Geometries>
+</Item>
+</{tag}>"""
+
+    def drawable(self, name, geometries, vertices, bound_children=0, tag="Drawable", skeleton=None):
+        bounds = self.composite(
+            bound_children, vertices) if bound_children else ""
+        return f"""<{tag}>
+<Name>{name}</Name>
+{self.vector('BoundingSphereCenter')}
+{self.value('BoundingSphereRadius', self.number())}
+{self.vector('BoundingBoxMin')}
+{self.vector('BoundingBoxMax')}
+{self.value('LodDistHigh', 9998)}{self.value('LodDistMed', 9998)}{self.value('LodDistLow', 9998)}{self.value('LodDistVlow', 9998)}
+{self.shader_group(name)}
+{skeleton or self.skeleton(4)}
+{self.models('DrawableModelsHigh', geometries, vertices)}
+{bounds}
+</{tag}>"""
+
+    def sequence(self, values):
+        numbers = [str(self.random.randint(0, 1000)) for _ in range(values)]
+        rows = "\n".join(" ".join(numbers[start:start + 10])
+                         for start in range(0, len(numbers), 10))
+        return f"""<Item>
+<Hash>hash_5</Hash>
+{self.value('FrameCount', values)}
+<SequenceData>
+<Item>
+<Channels>
+<Item>{self.value('Type', 'StaticFloat')}{self.value('Value', self.number())}</Item>
+<Item>{self.value('Type', 'QuantizeFloat')}{self.value('Quantum', '0.01')}{self.value('Offset', '-1')}<Values>{rows}</Values></Item>
+<Item>{self.value('Type', 'StaticQuaternion')}{self.vector('Value', 4)}</Item>
+</Channels>
+</Item>
+</SequenceData>
+</Item>"""
+
+    def animation(self, index, values):
+        return f"""<Item>
+<Hash>anim{index}</Hash>
+{self.value('Unknown10', 1)}
+{self.value('FrameCount', values)}
+{self.value('SequenceFrameLimit', values)}
+{self.value('Duration', 1)}
+<Unknown1C>hash_0</Unknown1C>
+<BoneIds>
+<Item>{self.value('BoneId', 0)}{self.value('Track', 5)}{self.value('Unk0', 0)}</Item>
+</BoneIds>
+<Sequences>
+{self.sequence(values)}
+</Sequences>
+</Item>"""
+
+    def clip(self, index):
+        return f"""<Item>
+<Hash>hash_{index}</Hash>
+<Name>pack:/clip{index}.clip</Name>
+{self.value('Type', 'Animation')}
+{self.value('Unknown30', 0)}
+<Tags />
+<Properties />
+<AnimationHash>anim{index}</AnimationHash>
+{self.value('StartTime', 0)}
+{self.value('EndTime', '1.5')}
+{self.value('Rate', 1)}
+</Item>"""
+
+
+"""Write a drawable with geometries geometries of vertices vertices each, and composite bounds of bound_children
+children to filepath"""
+
+
+def write_drawable(filepath, geometries, vertices, bound_children=0, seed=0):
+    with open(filepath, "w") as file:
+        file.write(HEADER + Generator(seed).drawable("synthetic",
+                   geometries, vertices, bound_children))
+
+
+"""Write a drawable dictionary of drawables drawables to filepath. If bones is given, the drawables hold the same
+skeleton of bones bones"""
+
+
+def write_drawable_dictionary(filepath, drawables, geometries, vertices, bones=None, seed=0):
+    generator = Generator(seed)
+    skeleton = generator.skeleton(bones) if bones else None
+    items = "\n".join(generator.drawable(f"drawable_{index:03d}", geometries, vertices, tag="Item", skeleton=skeleton)
+                      for index in range(drawables))
+    with open(filepath, "w") as file:
+        file.write(HEADER + "<DrawableDictionary>\n" +
+                   items + "\n</DrawableDictionary>\n")
+
+
+"""Write composite bounds of children children to filepath, every other child is a GeometryBVH of vertices vertices"""
+
+
+def write_bounds(filepath, children, vertices, seed=0):
+    with open(filepath, "w") as file:
+        file.write(HEADER + "<BoundsFile>\n" +
+                   Generator(seed).composite(children, vertices) + "\n</BoundsFile>\n")
+
+
+"""Write a clip dictionary of clips clips, each with an animation of values quantized values, to filepath"""
+
+
+def write_clips(filepath, clips, values, seed=0):
+    generator = Generator(seed)
+    clip_items = "\n".join(generator.clip(index) for index in range(clips))
+    animations = "\n".join(generator.animation(index, values)
+                           for index in range(clips))
+    with open(filepath, "w") as file:
+        file.write(HEADER + f"<ClipsDictionary>\n<Clips>\n{clip_items}\n</Clips>\n<Animations>\n{animations}\n"
+                   "</Animations>\n</ClipsDictionary>\n")
@@ -0,0 +1,18 @@
+import os
+import sys
+import types
+
+try:
+    # The bpy module (pip install bpy) makes mathutils importable, and lets the tests of the Blender parts run
+    import bpy
+except ImportError:
+    pass
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The addon's __init__ registers its Blender classes, so the package is loaded without running it.
+# The resources only need numpy and mathutils, which lets them be tested outside of Blender.
+if "sollumz" not in sys.modules:
+    package = types.ModuleType("sollumz")
+    package.__path__ = [ROOT]
+    sys.modules["sollumz"] = package
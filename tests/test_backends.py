@@ -0,0 +1,43 @@
+import os
+
+import pytest
+
+pytest.importorskip("mathutils")
+pytest.importorskip("lxml")
+
+from sollumz.resources import codewalker_xml
+from sollumz.resources.codewalker_xml import get_content_key
+from sollumz.resources.drawable import YDR
+from sollumz.resources.bound import YBN
+from sollumz.resources.clipsdictionary import YCD
+
+DATA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+
+@pytest.mark.parametrize("facade, filename", [
+    (YDR, "drawable.ydr.xml"),
+    (YBN, "bounds.ybn.xml"),
+    (YCD, "clips.ycd.xml"),
+])
+def test_lxml_matches_stdlib(monkeypatch, facade, filename):
+    filepath = os.path.join(DATA, filename)
+    assert codewalker_xml.lxml_etree is not None
+    with_lxml = facade.from_xml_file(filepath)
+
+    monkeypatch.setattr(codewalker_xml, "lxml_etree", None)
+    with_stdlib = facade.from_xml_file(filepath)
+
+    assert get_content_key(with_lxml) == get_content_key(with_stdlib)
+
+
+def test_written_files_match(monkeypatch, tmp_path):
+    filepath = os.path.join(DATA, "drawable.ydr.xml")
+    lxml_path = os.path.join(tmp_path, "lxml.ydr.xml")
+    stdlib_path = os.path.join(tmp_path, "stdlib.ydr.xml")
+    YDR.write_xml(YDR.from_xml_file(filepath), lxml_path)
+
+    monkeypatch.setattr(codewalker_xml, "lxml_etree", None)
+    YDR.write_xml(YDR.from_xml_file(filepath), stdlib_path)
+
+    with open(lxml_path, "rb") as lxml_file, open(stdlib_path, "rb") as stdlib_file:
+        assert lxml_file.read() == stdlib_file.read()
@@ -0,0 +1,205 @@
+import os
+import pickle
+
+import pytest
+
+pytest.importorskip("mathutils")
+
+from sollumz.resources.codewalker_xml import get_content_key
+from sollumz.resources.drawable import YDR, YDD, DrawableDictionary
+from sollumz.resources.bound import BoundsComposite
+
+DATA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+
+def test_embedded_composite_bounds():
+    drawable = YDR.from_xml_file(os.path.join(DATA, "drawable.ydr.xml"))
+
+    assert isinstance(drawable.bound, BoundsComposite)
+    assert [type(child).__name__ for child in drawable.bound.children] == [
+        "BoundBox", "BoundGeometryBVH"]
+
+
+def test_embedded_bounds_are_decoded_in_one_pass(monkeypatch):
+    """The drawable and its embedded bounds are decoded from one walk of the document, every element once"""
+    from collections import Counter
+    from xml.etree import ElementTree as ET
+    from sollumz.resources import codewalker_xml, bound
+
+    filepath = os.path.join(DATA, "drawable.ydr.xml")
+    decoded = Counter()
+    tokenized = Counter()
+
+    new_from_xml = codewalker_xml.ElementTree.new_from_xml.__func__
+
+    def counting_new_from_xml(cls, element):
+        decoded[cls.__name__] += 1
+        return new_from_xml(cls, element)
+
+    iterparse_xml = codewalker_xml.iterparse_xml
+
+    def counting_iterparse_xml(filepath, events):
+        for event, element in iterparse_xml(filepath, events):
+            tokenized[event] += 1
+            yield event, element
+
+    def counting_from_xml(prop_type):
+        from_xml = prop_type.from_xml
+
+        def counting(element):
+            decoded[prop_type.__name__] += 1
+            return from_xml(element)
+        return staticmethod(counting)
+
+    monkeypatch.setattr(codewalker_xml.ElementTree,
+                        "new_from_xml", classmethod(counting_new_from_xml))
+    monkeypatch.setattr(codewalker_xml, "iterparse_xml",
+                        counting_iterparse_xml)
+    for prop_type in (bound.VerticesProperty, bound.PolygonsProperty):
+        monkeypatch.setattr(prop_type, "from_xml",
+                            counting_from_xml(prop_type))
+
+    drawable = YDR.from_xml_file(filepath)
+
+    assert isinstance(drawable.bound, BoundsComposite)
+    elements = sum(1 for _ in ET.parse(filepath).getroot().iter())
+    assert tokenized == {"start": elements, "end": elements}
+    assert {name: count for name, count in decoded.items() if name.startswith(("Bound", "Vertices", "Polygons"))} == {
+        "BoundsComposite": 1, "BoundBox": 1, "BoundGeometryBVH": 1, "VerticesProperty": 1, "PolygonsProperty": 1}
+
+
+def write_dictionary(tmp_path, names, unique=None):
+    """Write a drawable dictionary of copies of the test drawable. The drawable named unique gets another render bucket"""
+    with open(os.path.join(DATA, "drawable.ydr.xml")) as file:
+        drawable = file.read().split("?>", 1)[-1].strip()
+
+    items = []
+    for name in names:
+        item = drawable.replace("<Drawable>", "<Item>").replace(
+            "</Drawable>", "</Item>").replace("<Name>test</Name>", f"<Name>{name}</Name>")
+        if name == unique:
+            item = item.replace('<RenderBucket value="0" />',
+                                '<RenderBucket value="1" />')
+        items.append(item)
+
+    filepath = os.path.join(tmp_path, "dictionary.ydd.xml")
+    with open(filepath, "w") as file:
+        file.write("<DrawableDictionary>\n" +
+                   "\n".join(items) + "\n</DrawableDictionary>\n")
+    return filepath
+
+
+def test_parse_selection():
+    assert DrawableDictionary.parse_selection(" Head_000, 0x1A2B,123, 0xzz, ,") == {
+        "Head_000", 0x1A2B, "123", "0xzz"}
+    assert DrawableDictionary.parse_selection(" , ") is None
+
+
+def test_selection(tmp_path):
+    from sollumz.tools import jenkhash
+
+    filepath = write_dictionary(tmp_path, ["Head_000", "123", "c"])
+
+    def select(text):
+        return list(YDD.from_xml_file(filepath, DrawableDictionary.parse_selection(text)))
+
+    # Names are compared without case, and numbers are names
+    assert select("HEAD_000, 123") == ["Head_000", "123"]
+    assert select(hex(jenkhash.Generate("c"))) == ["c"]
+    assert select(hex(jenkhash.Generate("head_000")).upper()) == ["Head_000"]
+    assert select(str(jenkhash.Generate("c"))) == []
+
+
+def test_single_drawable_is_not_shared(tmp_path):
+    dictionary = YDD.from_xml_file(write_dictionary(tmp_path, ["a"]))
+
+    assert dictionary._shared == set()
+    dictionary["a"].shader_group.shaders[0].name = "changed"
+
+
+def test_shared_shaders_are_copied_on_write(tmp_path):
+    dictionary = YDD.from_xml_file(write_dictionary(
+        tmp_path, ["a", "b", "c"], unique="c"))
+    shader = dictionary["a"].shader_group.shaders[0]
+    other = dictionary["b"].shader_group.shaders[0]
+
+    # Each drawable has its own view of the same properties
+    assert vars(shader) is vars(other)
+    assert vars(dictionary["c"].shader_group.shaders[0]) is not vars(shader)
+    # c still shares the textures and the skeleton
+    assert vars(dictionary["c"].skeleton) is vars(dictionary["a"].skeleton)
+    assert dictionary._shared == {"a", "b", "c"}
+
+    shader.name = "changed"
+    assert shader.name == "changed"
+    assert other.name == "normal_spec"
+    assert vars(shader) is not vars(other)
+
+    # Modifying an element or a list read from a view copies the element for its holder only
+    dictionary["b"].shader_group.shaders[0].parameters[0].texture_name = "changed"
+    parameters = dictionary["c"].shader_group.shaders[0].parameters
+    parameters.pop()
+    assert len(parameters) == 3
+    assert len(dictionary["c"].shader_group.shaders[0].parameters) == 3
+    assert other.parameters[0].texture_name == "changed"
+    assert shader.parameters[0].texture_name != "changed"
+    assert len(shader.parameters) == 4
+
+    bone = dictionary["c"].skeleton.bones[1]
+    with pytest.raises(TypeError):
+        # Vectors of shared elements are frozen
+        bone.translation.x = 1
+    bone.translation = bone.translation * 2
+    assert bone.translation == dictionary["a"].skeleton.bones[1].translation * 2
+    assert dictionary["c"].skeleton.bones[1].translation == bone.translation
+    assert vars(dictionary["a"].skeleton) is vars(dictionary["b"].skeleton)
+
+
+def test_write_shared_dictionary(tmp_path):
+    filepath = write_dictionary(tmp_path, ["a", "b"])
+    dictionary = YDD.from_xml_file(filepath)
+    dictionary["a"].shader_group.shaders[0].parameters[0].texture_name = "changed"
+
+    def write(dictionary):
+        written = os.path.join(tmp_path, "written.ydd.xml")
+        dictionary.write_xml(written)
+        with open(written) as file:
+            return file.read().split("\n  <Item>")[1:]
+
+    items = write(dictionary)
+    assert "<Name>changed</Name>" in items[0]
+    # Written like b alone, which doesn't share anything
+    assert items[1] == write(YDD.from_xml_file(
+        write_dictionary(tmp_path, ["b"])))[0]
+
+
+def test_get_unshared(tmp_path):
+    dictionary = YDD.from_xml_file(
+        write_dictionary(tmp_path, ["a", "b"]))
+
+    drawable = dictionary.get_unshared("a")
+    shader = drawable.shader_group.shaders[0]
+    assert type(shader).__name__ == "ShaderItem"
+    shader.name = "changed"
+    shader.parameters.pop()
+
+    other = dictionary["b"].shader_group.shaders[0]
+    assert other.name == "normal_spec"
+    assert len(other.parameters) == 4
+    assert get_content_key(drawable.skeleton) == get_content_key(
+        dictionary["b"].skeleton)
+    assert vars(drawable.skeleton) is not vars(dictionary["b"].skeleton)
+
+
+def test_shared_elements_survive_pickling(tmp_path):
+    # Registers the mathutils types with pickle
+    import sollumz.resources.xml_cache
+
+    dictionary = pickle.loads(pickle.dumps(YDD.from_xml_file(
+        write_dictionary(tmp_path, ["a", "b"]))))
+
+    shader = dictionary["a"].shader_group.shaders[0]
+    other = dictionary["b"].shader_group.shaders[0]
+    assert vars(shader) is vars(other)
+    shader.name = "changed"
+    assert other.name == "normal_spec"
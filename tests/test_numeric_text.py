@@ -0,0 +1,86 @@
+import numpy
+import pytest
+
+from sollumz.resources.numeric_text import parse_numbers, parse_rows, format_numbers, format_rows, format_columns
+
+
+def test_parse_numbers():
+    values = parse_numbers("1 2.5\n -3   4e2 ")
+    assert values.tolist() == [1.0, 2.5, -3.0, 400.0]
+
+
+def test_parse_numbers_separator():
+    values = parse_numbers("1, 2, 3\n4, 5, 6", numpy.uint32, ",")
+    assert values.dtype == numpy.uint32
+    assert values.tolist() == [1, 2, 3, 4, 5, 6]
+
+
+def test_parse_rows():
+    rows = parse_rows("\n  1 2 3\n  4 5 6\n")
+    assert rows.shape == (2, 3)
+    assert rows.tolist() == [[1, 2, 3], [4, 5, 6]]
+
+
+def test_parse_rows_empty():
+    assert parse_rows("  \n ").shape == (0, 0)
+
+
+def test_parse_rows_mismatch():
+    with pytest.raises(ValueError):
+        parse_rows("1 2 3\n4 5")
+
+
+def test_format_numbers():
+    values = numpy.array([1.0, -0.0, 0.0, 0.5, 0.1, -2.25, 123456.7, 3e-5])
+    assert format_numbers(values).tolist() == [
+        "1.0", "-0.0", "0.0", "0.5", "0.1", "-2.25", "123456.7", "3e-05"]
+
+
+def test_format_numbers_ints():
+    values = numpy.array([0, 255, 65535], dtype=numpy.uint16)
+    assert format_numbers(values).tolist() == ["0", "255", "65535"]
+
+
+def test_format_numbers_keeps_shape():
+    assert format_numbers(numpy.zeros((4, 3))).shape == (4, 3)
+
+
+def test_format_numbers_round_trip():
+    rng = numpy.random.default_rng(0)
+    values = numpy.concatenate([
+        rng.standard_normal(5000) * 10.0 ** rng.integers(-8, 8, 5000),
+        rng.integers(-1000, 1000, 500).astype(numpy.float64),
+    ]).astype(numpy.float32)
+
+    text = " ".join(format_numbers(values).tolist())
+    parsed = parse_numbers(text, numpy.float32)
+
+    assert parsed.tobytes() == values.tobytes()
+
+
+def test_format_numbers_matches_str_of_float32():
+    rng = numpy.random.default_rng(1)
+    values = numpy.concatenate([
+        rng.standard_normal(2000) * 10.0 ** rng.integers(-12, 12, 2000),
+        numpy.round(rng.standard_normal(200) * 1000),
+        [1e7, 1e16, -0.0, 0.0],
+    ]).astype(numpy.float32)
+    # How the numbers were written before the codec, one str() per number
+    expected = [str(value) for value in values]
+    assert format_numbers(values).tolist() == expected
+
+
+def test_format_rows():
+    values = numpy.array([[1.0, 2.5], [-0.0, 3.0]])
+    assert format_rows(values) == "1.0 2.5\n-0.0 3.0"
+    assert format_rows(values, ", ", "\n  ") == "1.0, 2.5\n  -0.0, 3.0"
+
+
+@pytest.mark.parametrize("count", [0, 1, 23, 24, 25, 48, 50])
+def test_format_columns_round_trip(count):
+    values = numpy.arange(count, dtype=numpy.uint32)
+    text = format_columns(values, 24)
+
+    assert parse_numbers(text, numpy.uint32).tolist() == values.tolist()
+    lines = text.split("\n")
+    assert all(len(line.split()) == 24 for line in lines[:count // 24])
@@ -0,0 +1,44 @@
+import os
+
+import pytest
+
+pytest.importorskip("mathutils")
+
+from sollumz.resources.profiler import Profiler, profiler
+from sollumz.resources.drawable import YDR
+
+DATA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+
+@pytest.fixture
+def profiled():
+    profiler.reset()
+    profiler.enable()
+    yield profiler
+    profiler.disable()
+    profiler.reset()
+
+
+def test_composite_elements_are_timed(profiled):
+    YDR.from_xml_file(os.path.join(DATA, "drawable.ydr.xml"))
+
+    for name in ("Drawable.from_xml", "GeometryItem.from_xml", "VertexBuffer.from_xml", "ShaderItem.from_xml"):
+        assert name in profiled.classes
+    geometry = profiled.classes["GeometryItem.from_xml"]
+    assert geometry.calls == 4
+    assert 0 <= geometry.self_time <= geometry.total_time
+
+
+def test_tokenizing_is_a_separate_stage(profiled):
+    YDR.from_xml_file(os.path.join(DATA, "drawable.ydr.xml"))
+
+    assert profiled.stages["Tokenize XML"].total_time > 0
+    assert profiled.stages["Build objects"].total_time >= 0
+    assert profiled.stages["Build objects"].calls == 1
+
+
+def test_disabled_profiler_records_nothing():
+    disabled = Profiler()
+    with disabled.stage("Stage"):
+        assert list(disabled.iterate([1, 2], "Items")) == [1, 2]
+    assert disabled.stages == {}
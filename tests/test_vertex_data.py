@@ -0,0 +1,67 @@
+import numpy
+import pytest
+
+pytest.importorskip("mathutils")
+
+from sollumz.resources.drawable import VertexDataProperty, VertexLayoutListProperty
+
+
+def legacy_vertex_text(vertices):
+    """How VertexDataProperty.to_xml wrote vertices before the column formatter, one str() per component"""
+    text = []
+    for vertex in vertices:
+        for name in vertices.dtype.names:
+            text.append(' '.join([str(item)
+                                  for item in vertex[name]]) + '   ')
+        text.append('\n')
+    return ''.join(text)
+
+
+def make_layout(names):
+    layout = VertexLayoutListProperty()
+    layout.value = names
+    return layout
+
+
+def test_vertex_data_text():
+    vertices = numpy.zeros(2, make_layout(
+        ["Position", "Colour0", "TexCoord0"]).dtype)
+    vertices["position"] = [[1.0, -0.0, 0.1], [-2.25, 123456.7, 3e-5]]
+    vertices["colour0"] = [[255, 0, 1, 2], [3, 4, 5, 6]]
+    vertices["texcoord0"] = [[5.0, 0.0], [-1.5, 10.0]]
+
+    data = VertexDataProperty()
+    data.value = vertices
+    assert data.to_xml().text == (
+        "1.0 -0.0 0.1   255 0 1 2   5.0 0.0   \n"
+        "-2.25 123456.7 3e-05   3 4 5 6   -1.5 10.0   \n")
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_vertex_data_round_trip(seed):
+    rng = numpy.random.default_rng(seed)
+    layout = make_layout(
+        ["Position", "Normal", "Colour0", "TexCoord0", "Tangent"])
+
+    vertices = numpy.empty(int(rng.integers(1, 200)), layout.dtype)
+    for name in layout.dtype.names:
+        shape = vertices[name].shape
+        if vertices.dtype[name].base.kind == "u":
+            vertices[name] = rng.integers(0, 256, shape)
+        else:
+            # Mix whole numbers and -0.0 in, they keep their fraction and sign
+            values = rng.standard_normal(shape) * 100
+            whole = rng.random(shape) < 0.2
+            values[whole] = numpy.round(values[whole])
+            values[rng.random(shape) < 0.05] = -0.0
+            vertices[name] = values
+
+    data = VertexDataProperty()
+    data.value = vertices
+    text = data.to_xml().text
+    assert text == legacy_vertex_text(vertices)
+
+    decoder = VertexDataProperty()
+    decoder.layout = layout
+    decoded = decoder.decode(text)
+    assert decoded.tobytes() == vertices.tobytes()
@@ -0,0 +1,121 @@
+import os
+import pickle
+
+import pytest
+
+pytest.importorskip("mathutils")
+
+from sollumz.resources.xml_cache import read_cached, get_cache_path
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(os, "getuid"), reason="File owners are only checked on POSIX")
+
+
+class Reader:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, filepath):
+        self.calls += 1
+        return {"decoded": filepath}
+
+
+@pytest.fixture
+def source(tmp_path):
+    filepath = os.path.join(tmp_path, "drawable.ydr.xml")
+    with open(filepath, "w") as file:
+        file.write("<Drawable />")
+    return filepath
+
+
+def test_second_read_is_cached(tmp_path, source):
+    cache_directory = os.path.join(tmp_path, "cache")
+    read = Reader()
+
+    assert read_cached(source, read, cache_directory, 1024 ** 2) == {
+        "decoded": source}
+    assert read_cached(source, read, cache_directory, 1024 ** 2) == {
+        "decoded": source}
+    assert read.calls == 1
+    assert os.stat(cache_directory).st_mode & 0o777 == 0o700
+    assert os.stat(get_cache_path(source, cache_directory)
+                   ).st_mode & 0o777 == 0o600
+
+
+def test_writable_entry_is_not_loaded(tmp_path, source):
+    cache_directory = os.path.join(tmp_path, "cache")
+    os.makedirs(cache_directory, mode=0o700)
+    cache_path = get_cache_path(source, cache_directory)
+    with open(cache_path, "wb") as file:
+        pickle.dump("planted", file)
+    os.chmod(cache_path, 0o666)
+
+    read = Reader()
+    assert read_cached(source, read, cache_directory, 1024 ** 2) == {
+        "decoded": source}
+    assert read.calls == 1
+
+
+def test_shared_directory_is_not_used(tmp_path, source):
+    cache_directory = os.path.join(tmp_path, "cache")
+    os.makedirs(cache_directory)
+    os.chmod(cache_directory, 0o777)
+    cache_path = get_cache_path(source, cache_directory)
+    with open(cache_path, "wb") as file:
+        pickle.dump("planted", file)
+    os.chmod(cache_path, 0o600)
+
+    read = Reader()
+    read_cached(source, read, cache_directory, 1024 ** 2)
+    read_cached(source, read, cache_directory, 1024 ** 2)
+    assert read.calls == 2
+
+
+def write_lod_drawable(tmp_path):
+    """Write the test drawable with a copy of its high detail models as its low detail models"""
+    data = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+    with open(os.path.join(data, "drawable.ydr.xml")) as file:
+        drawable = file.read()
+
+    start = drawable.index("<DrawableModelsHigh>")
+    end = drawable.index("</DrawableModelsHigh>") + len("</DrawableModelsHigh>")
+    low = drawable[start:end].replace("DrawableModelsHigh", "DrawableModelsLow")
+
+    filepath = os.path.join(tmp_path, "lods.ydr.xml")
+    with open(filepath, "w") as file:
+        file.write(drawable[:end] + "\n" + low + drawable[end:])
+    return filepath
+
+
+def get_buffer_data(models):
+    return [prop for model in models for geometry in model.geometries
+            for prop in (geometry.vertex_buffer.get_element("data"), geometry.index_buffer.get_element("data"))]
+
+
+def test_skipped_lods_stay_undecoded(tmp_path):
+    from sollumz.resources.drawable import YDR
+
+    filepath = write_lod_drawable(tmp_path)
+    cache_directory = os.path.join(tmp_path, "cache")
+
+    def read_high_lod(filepath):
+        # Like an import of only the high LOD, which decodes the high models before the entry is written
+        drawable = YDR.from_xml_file(filepath)
+        for prop in get_buffer_data(drawable.drawable_models_high):
+            prop.value
+        return drawable
+
+    drawable = read_cached(filepath, read_high_lod,
+                           cache_directory, 1024 ** 2)
+    low = get_buffer_data(drawable.drawable_models_low)
+    assert low and not any(prop.is_decoded for prop in low)
+
+    cached = read_cached(filepath, None, cache_directory, 1024 ** 2)
+    assert cached is not drawable
+    assert all(prop.is_decoded for prop in get_buffer_data(
+        cached.drawable_models_high))
+    cached_low = get_buffer_data(cached.drawable_models_low)
+    assert not any(prop.is_decoded for prop in cached_low)
+
+    for prop, cached_prop in zip(low, cached_low):
+        assert cached_prop.value.tobytes() == prop.value.tobytes()
@@ -0,0 +1,87 @@
+import difflib
+import io
+import os
+import random
+from xml.etree import ElementTree as ET
+
+import pytest
+
+pytest.importorskip("mathutils")
+
+from sollumz.resources.codewalker_xml import XmlWriter, indent
+from sollumz.resources.drawable import YDR
+
+DATA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+
+def legacy_write(element):
+    """How write_xml wrote files before XmlWriter: indent() the ET tree and let ElementTree serialize it"""
+    indent(element)
+    file = io.BytesIO()
+    ET.ElementTree(element).write(
+        file, encoding="UTF-8", xml_declaration=True)
+    return file.getvalue()
+
+
+def writer_write(element):
+    file = io.StringIO()
+    file.write("<?xml version='1.0' encoding='UTF-8'?>\n")
+    XmlWriter(file).element(element)
+    return file.getvalue().encode("UTF-8")
+
+
+def random_tree(rng, depth=0):
+    element = ET.Element(rng.choice(["Item", "Data", "Name", "Bounds"]))
+    for _ in range(rng.randint(0, 2)):
+        element.set(rng.choice(["value", "x", "type", "name"]), rng.choice(
+            ["0", "1.5", "a & b", "\"quoted\"", "<tag>", ""]))
+
+    children = rng.randint(0, 3) if depth < 4 else 0
+    if children:
+        for _ in range(children):
+            element.append(random_tree(rng, depth + 1))
+    else:
+        element.text = rng.choice([None, "", "text", "  padded  ", "1 2 3\n4 5 6\n", "\n  a < b\n  c & d\n",
+                                   "line\n"])
+    return element
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_writer_matches_indent(seed):
+    element = random_tree(random.Random(seed))
+    expected = legacy_write(element)
+    # indent() modified the tree, so write a fresh copy
+    assert writer_write(random_tree(random.Random(seed))) == expected
+
+
+def read_expected_changes(filepath):
+    """The unified diff in filepath, without its header of comments"""
+    with open(filepath, encoding="UTF-8") as file:
+        return [line for line in file if not line.startswith("#")]
+
+
+def test_write_xml_golden(tmp_path):
+    """drawable.expected.ydr.xml was written before this writer, the output may only differ from it in the ways listed
+    in drawable.expected.ydr.xml.diff"""
+    drawable = YDR.from_xml_file(os.path.join(DATA, "drawable.ydr.xml"))
+    filepath = os.path.join(tmp_path, "drawable.ydr.xml")
+    YDR.write_xml(drawable, filepath)
+
+    with open(filepath, encoding="UTF-8") as file:
+        written = file.readlines()
+    with open(os.path.join(DATA, "drawable.expected.ydr.xml"), encoding="UTF-8") as file:
+        expected = file.readlines()
+
+    changes = list(difflib.unified_diff(
+        expected, written, "drawable.expected.ydr.xml", "drawable.ydr.xml written by write_xml"))
+    assert changes == read_expected_changes(
+        os.path.join(DATA, "drawable.expected.ydr.xml.diff"))
+
+
+def test_write_xml_matches_to_xml(tmp_path):
+    drawable = YDR.from_xml_file(os.path.join(DATA, "drawable.ydr.xml"))
+    filepath = os.path.join(tmp_path, "drawable.ydr.xml")
+    YDR.write_xml(drawable, filepath)
+
+    with open(filepath, "rb") as file:
+        assert file.read() == legacy_write(drawable.to_xml())
@@ -0,0 +1,64 @@
+from types import SimpleNamespace as Item
+
+import numpy
+import pytest
+
+pytest.importorskip("bpy")
+
+from mathutils import Matrix
+from sollumz.ydr.ydrexport import get_mesh_buffers
+from sollumz.resources.drawable import VertexLayoutListProperty
+
+
+class Collection(list):
+    """Stands in for a Blender collection of items, i.e. mesh.loops"""
+
+    def foreach_get(self, attribute, values):
+        values[:] = numpy.ravel([getattr(item, attribute) for item in self])
+
+
+def make_mesh():
+    """Two triangles sharing the edge of vertices 1 and 2. The normal of vertex 1 differs between the triangles"""
+    groups = [Item(group=group, weight=1.0) for group in range(4)]
+    vertices = Collection([
+        Item(co=(5, 0, 0), groups=groups),
+        Item(co=(1, 0, 0), groups=[Item(group=4, weight=1.0)]),
+        Item(co=(0, 1, 0), groups=[]),
+        Item(co=(0, 0, 0), groups=[]),
+    ])
+    normals = [(0, 0, 1), (0, 0, 1), (0, 0, 1),
+               (0, 0, 1), (0, 1, 0), (0, 0, 1)]
+    loops = Collection(Item(vertex_index=vertex_index, normal=normal)
+                       for vertex_index, normal in zip([0, 1, 2, 2, 1, 3], normals))
+    uvs = Collection(Item(uv=(vertex_index, 0.25))
+                     for vertex_index in [0, 1, 2, 2, 1, 3])
+
+    return Item(vertices=vertices, loops=loops, loop_triangles=Collection([Item(loops=(0, 1, 2)), Item(loops=(3, 4, 5))]),
+                uv_layers=[Item(data=uvs)], vertex_colors=[])
+
+
+def test_get_mesh_buffers():
+    layout = VertexLayoutListProperty()
+    layout.value = ["Position", "BlendWeights",
+                    "BlendIndices", "Normal", "TexCoord0"]
+    bones = [Item(name=f"bone{index}") for index in range(300)]
+    vertex_groups = [Item(name=f"bone{index}", lock_weight=False)
+                     for index in (0, 1, 2, 3, 299)]
+    obj = Item(matrix_world=Matrix.Translation((1, 0, 0)),
+               matrix_basis=Matrix(), vertex_groups=vertex_groups)
+
+    vertices, indices = get_mesh_buffers(obj, make_mesh(), layout.dtype, bones,
+                                         Item(use_transforms=True))
+
+    # Vertices are numbered in the order the loops first use them, the second loop of vertex 1 is another vertex
+    assert indices.tolist() == [0, 1, 2, 2, 3, 4]
+    assert vertices["position"].tolist() == [
+        [6, 0, 0], [2, 0, 0], [1, 1, 0], [2, 0, 0], [1, 0, 0]]
+    assert vertices["normal"][3].tolist() == [0, 1, 0]
+    assert vertices["texcoord0"][:, 0].tolist() == [0, 1, 2, 1, 3]
+    assert vertices["texcoord0"][:, 1].tolist() == [0.75] * 5
+    # Four full weights are normalized to 255 + 255 - 4 * 255, and bone 299 doesn't fit a byte. Both are clipped
+    assert vertices["blendweights"][0].tolist() == [0, 255, 255, 255]
+    assert vertices["blendindices"][0].tolist() == [0, 1, 2, 3]
+    assert vertices["blendweights"][1].tolist() == [255, 0, 0, 0]
+    assert vertices["blendindices"][1].tolist() == [255, 0, 0, 0]
@@ -0,0 +1,129 @@
+import os
+
+import numpy
+import pytest
+
+pytest.importorskip("bpy")
+
+from sollumz.ydr.ydrimport import create_uv_layer, create_vertexcolor_layer
+from sollumz.tools.meshhelper import create_mesh_from_triangles, get_attribute_array
+
+DATA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+
+def make_mesh():
+    """Two triangles sharing the edge of vertices 1 and 2"""
+    positions = [(0, 0, 0), (1, 0, 0), (0, 1, 0), (1, 1, 0)]
+    mesh = create_mesh_from_triangles(
+        "test", positions, numpy.array([0, 1, 2, 2, 1, 3]))
+    return mesh, get_attribute_array(mesh.loops, "vertex_index", dtype=numpy.int32)
+
+
+def test_uv_layer_is_fitted_to_two_components():
+    mesh, loop_vertex_indices = make_mesh()
+    # Four components per vertex, only the first two are a uv
+    texcoords = numpy.array([[index, 0.25, 7, 7]
+                            for index in range(4)], dtype=numpy.float32)
+    create_uv_layer(mesh, 0, "UVMap", texcoords, loop_vertex_indices)
+    # One component per vertex, the v coordinate is 0 before flipping
+    create_uv_layer(mesh, 1, "UVMap 1",
+                    texcoords[:, 0], loop_vertex_indices)
+
+    assert [tuple(item.uv) for item in mesh.uv_layers["UVMap"].data] == [
+        (index, 0.75) for index in [0, 1, 2, 2, 1, 3]]
+    assert [tuple(item.uv) for item in mesh.uv_layers["UVMap 1"].data] == [
+        (index, 1) for index in [0, 1, 2, 2, 1, 3]]
+
+
+def test_vertexcolor_layer_is_fitted_to_four_components():
+    mesh, loop_vertex_indices = make_mesh()
+    colors = numpy.array([[0, 51, 255, 102], [255, 0, 0, 0], [0, 255, 0, 255], [0, 0, 255, 51]],
+                         dtype=numpy.uint8)
+    create_vertexcolor_layer(mesh, 0, "Colour0", colors, loop_vertex_indices)
+    # Colours without alpha are opaque
+    create_vertexcolor_layer(mesh, 1, "Colour1",
+                             colors[:, :3], loop_vertex_indices)
+
+    expected = colors[loop_vertex_indices] / 255
+    assert numpy.allclose([tuple(item.color)
+                           for item in mesh.vertex_colors["Colour0"].data], expected)
+    expected[:, 3] = 1
+    assert numpy.allclose([tuple(item.color)
+                           for item in mesh.vertex_colors["Colour1"].data], expected)
+
+
+@pytest.fixture
+def material_properties():
+    """Register the properties of the materials and their image nodes, like the addon does"""
+    import bpy
+    from sollumz.ydr.properties import ShaderProperties, TextureFlags, TextureProperties
+
+    classes = (ShaderProperties, TextureFlags, TextureProperties)
+    for cls in classes:
+        bpy.utils.register_class(cls)
+    bpy.types.Material.shader_properties = bpy.props.PointerProperty(
+        type=ShaderProperties)
+    bpy.types.ShaderNodeTexImage.texture_properties = bpy.props.PointerProperty(
+        type=TextureProperties)
+    bpy.types.ShaderNodeTexImage.texture_flags = bpy.props.PointerProperty(
+        type=TextureFlags)
+    yield
+    del bpy.types.Material.shader_properties
+    del bpy.types.ShaderNodeTexImage.texture_properties
+    del bpy.types.ShaderNodeTexImage.texture_flags
+    for cls in reversed(classes):
+        bpy.utils.unregister_class(cls)
+
+
+def test_files_sharing_textures_share_materials(tmp_path, monkeypatch, material_properties):
+    """Two files of a directory with the same shader, textures of the shared texture folder and embedded textures"""
+    import bpy
+    from types import SimpleNamespace
+    from sollumz.ydr import ydrimport
+    from sollumz.resources.drawable import YDR
+    from sollumz.resources.shader import ShaderManager
+
+    created = []
+
+    def create_shader(name, filename=None):
+        """The node tree of create_shader needs the Blender version of the addon, only its image nodes are made"""
+        material = bpy.data.materials.new(name)
+        material.use_nodes = True
+        for param in ShaderManager.shaders[name].parameters:
+            if param.type == "Texture":
+                material.node_tree.nodes.new(
+                    "ShaderNodeTexImage").name = param.name
+        created.append(material)
+        return material
+
+    shared_folder = tmp_path / "shared"
+    shared_folder.mkdir()
+    (shared_folder / "shared_n.dds").write_bytes(b"DDS ")
+    preferences = SimpleNamespace(shared_texture_folder=str(shared_folder),
+                                  reuse_materials=True, persist_material_keys=False)
+    monkeypatch.setattr(ydrimport, "get_addon_preferences",
+                        lambda: preferences)
+    monkeypatch.setattr(ydrimport, "create_shader", create_shader)
+    ydrimport.on_file_loaded(None)
+
+    with open(os.path.join(DATA, "drawable.ydr.xml")) as file:
+        text = file.read()
+
+    def import_materials(name):
+        filepath = tmp_path / (name + ".ydr.xml")
+        filepath.write_text(text)
+        drawable = YDR.from_xml_file(str(filepath))
+        return ydrimport.shadergroup_to_materials(drawable.shader_group, str(filepath))
+
+    materials = import_materials("a") + import_materials("b")
+    assert len(created) == 1
+    assert materials == created * 2
+    image = created[0].node_tree.nodes["BumpSampler"].image
+    assert os.path.normpath(bpy.path.abspath(image.filepath)) == str(
+        shared_folder / "shared_n.dds")
+
+    # The texture folder of c has its own shared_n
+    (tmp_path / "c").mkdir()
+    (tmp_path / "c" / "shared_n.dds").write_bytes(b"DDS ")
+    assert import_materials("c") == created[1:]
+    ydrimport.on_file_loaded(None)
@@ -1,5 +1,7 @@
 import bpy
 from mathutils import Vector
+from ..resources.xml_cache import read_cached, get_default_cache_directory
+from ..resources.profiler import profiler
 
 
 def create_brush(name):
@@ -84,50 +86,6 @@ def join_objects(objs):
     bpy.ops.object.select_all(action='DESELECT')
     return
 
-# MIT License
-
-# Copyright (c) 2017 GiveMeAllYourCats
-
-# Permission is hereby granted, free of charge, to any person obtaining a copy
-# of this software and associated documentation files (the 'Software'), to deal
-# in the Software without restriction, including without limitation the rights
-# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
-# copies of the Software, and to permit persons to whom the Software is
-# furnished to do so, subject to the following conditions:
-
-# The above copyright notice and this permission notice shall be included in
-# all copies or substantial portions of the Software.
-
-# THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
-# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
-# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
-# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
-# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
-# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
-# SOFTWARE.
-
-# Code author: GiveMeAllYourCats
-# Repo: https://github.com/michaeldegroot/cats-blender-plugin
-# Edits by: GiveMeAllYourCats, Hotox
-
-
-def remove_unused_vertex_groups_of_mesh(mesh):
-    remove_count = 0
-    mesh.update_from_editmode()
-
-    vgroup_used = {i: False for i, k in enumerate(mesh.vertex_groups)}
-
-    for v in mesh.data.vertices:
-        for g in v.groups:
-            if g.weight > 0.0:
-                vgroup_used[g.group] = True
-
-    for i, used in sorted(vgroup_used.items(), reverse=True):
-        if not used:
-            mesh.vertex_groups.remove(mesh.vertex_groups[i])
-            remove_count += 1
-    return remove_count
-
 
 def get_selected_vertices(obj):
     mode = obj.mode
@@ -152,3 +110,27 @@ def build_tag_bone_map(armature):
         tag_bone_map[pose_bone.bone.bone_properties.tag] = pose_bone.name
 
     return tag_bone_map
+
+
+def get_addon_preferences(context=None):
+    addon_key = __name__.split('.')[0]
+    return (context or bpy.context).preferences.addons[addon_key].preferences
+
+
+def get_import_cache_directory(preferences):
+    if preferences.import_cache_directory:
+        return bpy.path.abspath(preferences.import_cache_directory)
+    return get_default_cache_directory()
+
+
+"""Read filepath with read (i.e. YDR.from_xml_file), going through the import cache if it is enabled.
+Reads that only decode part of the file pass cached=False"""
+
+
+def read_xml_file(read, filepath, cached=True):
+    preferences = get_addon_preferences()
+    with profiler.stage("Read file"):
+        if not cached or not preferences.use_import_cache:
+            return read(filepath)
+
+        return read_cached(filepath, read, get_import_cache_directory(preferences), preferences.import_cache_size * 1024 * 1024)
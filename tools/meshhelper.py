@@ -1,5 +1,6 @@
 import bpy
 import bmesh
+import numpy
 from mathutils import Vector, Matrix
 from mathutils.geometry import distance_point_to_plane
 from math import radians
@@ -168,6 +169,43 @@ def flip_uv(uv):
     return [u, v]
 
 
+"""Get an attribute of every item of a Blender collection (i.e. the 'co' of mesh.vertices) as an array
+with a row per item, in one foreach_get call"""
+
+
+def get_attribute_array(collection, attribute, size=1, dtype=numpy.float32):
+    values = numpy.empty(len(collection) * size, dtype=dtype)
+    collection.foreach_get(attribute, values)
+    if size > 1:
+        return values.reshape(-1, size)
+    return values
+
+
+"""Create a mesh of triangles from an array of vertex positions and a flat array with three vertex indices per triangle.
+The mesh is filled with foreach_set straight from the arrays, without building the lists from_pydata needs"""
+
+
+def create_mesh_from_triangles(name, positions, indices):
+    positions = numpy.ascontiguousarray(positions, dtype=numpy.float32)
+    indices = numpy.ascontiguousarray(
+        indices[:len(indices) // 3 * 3], dtype=numpy.int32)
+    num_faces = len(indices) // 3
+
+    mesh = bpy.data.meshes.new(name)
+    mesh.vertices.add(len(positions))
+    mesh.vertices.foreach_set("co", positions.ravel())
+    mesh.loops.add(len(indices))
+    mesh.loops.foreach_set("vertex_index", indices)
+    mesh.polygons.add(num_faces)
+    mesh.polygons.foreach_set("loop_start", numpy.arange(
+        0, len(indices), 3, dtype=numpy.int32))
+    mesh.polygons.foreach_set(
+        "loop_total", numpy.full(num_faces, 3, dtype=numpy.int32))
+    mesh.update(calc_edges=True)
+
+    return mesh
+
+
 def get_short_long_edge(bbmin, bbmax):
     bbox = bpy.data.meshes.new('bbox')
     create_box_from_extents(
@@ -0,0 +1,58 @@
+"""Index of the .dds textures in a folder tree by texture name, so finding a texture doesn't walk the whole folder every time"""
+import os
+
+TEXTURE_EXTENSION = ".dds"
+
+
+class TextureIndex:
+    def __init__(self, folder):
+        self.folder = folder
+        # Texture name -> path of the texture
+        self.paths = {}
+        # Directory -> modification time of the directory when it was indexed
+        self.directory_mtimes = {}
+        self.build()
+
+    def build(self):
+        self.paths = {}
+        self.directory_mtimes = {}
+        for directory, _, filenames in os.walk(self.folder):
+            try:
+                self.directory_mtimes[directory] = os.stat(
+                    directory).st_mtime_ns
+            except OSError:
+                continue
+
+            for filename in filenames:
+                # normcase matches the file system, .DDS is found on windows but not on linux
+                name, extension = os.path.splitext(os.path.normcase(filename))
+                if extension == TEXTURE_EXTENSION:
+                    # A texture in a later directory replaces the one found before
+                    self.paths[name] = os.path.join(directory, filename)
+
+    """Whether a file or directory was added, removed or renamed in one of the indexed directories since the index was built"""
+
+    def is_outdated(self):
+        for directory, mtime in self.directory_mtimes.items():
+            try:
+                if os.stat(directory).st_mtime_ns != mtime:
+                    return True
+            except OSError:
+                return True
+        return False
+
+    def get_path(self, texture_name):
+        return self.paths.get(os.path.normcase(texture_name))
+
+
+texture_indices = {}
+
+
+"""Get the index of folder. The index is built on the first call and then reused until one of the directories changes"""
+
+
+def get_texture_index(folder):
+    index = texture_indices.get(folder)
+    if index is None or index.is_outdated():
+        index = texture_indices[folder] = TextureIndex(folder)
+    return index
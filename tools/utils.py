@@ -12,11 +12,20 @@ def divide_list(list, d):
     return result
 
 
-def float32_list(list):
-    result = []
-    for item in list:
-        result.append(numpy.float32(item))
-    return result
+"""Round a whole array of values (i.e. every position of a mesh) to float32 at once. Adding 0.0 turns -0.0 into 0.0,
+so equal values also have equal bytes"""
+
+
+def float32_array(values):
+    return numpy.asarray(values, dtype=numpy.float32) + numpy.float32(0.0)
+
+
+"""Transform an array of 3D points by a 4x4 matrix"""
+
+
+def transform_points(points, matrix):
+    matrix = numpy.array(matrix, dtype=numpy.float64)
+    return points @ matrix[:3, :3].T + matrix[:3, 3]
 
 
 def subtract_from_vector(v, f):
@@ -6,6 +6,8 @@ from .collision_materials import create_collision_material_from_index, collision
 from ..sollumz_ui import SOLLUMZ_UI_NAMES
 from ..tools.meshhelper import *
 from ..tools.utils import *
+from ..tools.blenderhelper import read_xml_file
+from ..resources.profiler import profiler
 import os
 from mathutils import Matrix
 
@@ -364,6 +366,7 @@ def composite_to_obj(bounds, name, from_drawable=False):
 
 
 def import_ybn(filepath):
-    ybn_xml = YBN.from_xml_file(filepath)
-    composite_to_obj(ybn_xml, os.path.basename(
-        filepath.replace(YBN.file_extension, '')))
+    ybn_xml = read_xml_file(YBN.from_xml_file, filepath)
+    with profiler.stage("Create Blender objects"):
+        composite_to_obj(ybn_xml, os.path.basename(
+            filepath.replace(YBN.file_extension, '')))
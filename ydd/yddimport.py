@@ -1,11 +1,13 @@
 import bpy
 import os
 from ..tools.drawablehelper import join_drawable_geometries
+from ..resources.profiler import profiler
+from ..tools.blenderhelper import read_xml_file
 from ..resources.drawable import *
 from ..ydr.ydrimport import drawable_to_obj
 
 
-def drawable_dict_to_obj(drawable_dict, filepath):
+def drawable_dict_to_obj(drawable_dict, filepath, lods=None):
 
     name = os.path.basename(filepath)[:-8]
     vmodels = []
@@ -21,7 +23,7 @@ def drawable_dict_to_obj(drawable_dict, filepath):
 
     for drawable in drawable_dict.values():
         drawable_obj = drawable_to_obj(
-            drawable, filepath, drawable.name, bones_override=drawable_with_skel.skeleton.bones if drawable_with_skel else None)
+            drawable, filepath, drawable.name, bones_override=drawable_with_skel.skeleton.bones if drawable_with_skel else None, lods=lods)
         if (armature_with_skel_obj is None and drawable_with_skel is not None and len(drawable.skeleton.bones) > 0):
             armature_with_skel_obj = drawable_obj
 
@@ -56,8 +58,13 @@ def drawable_dict_to_obj(drawable_dict, filepath):
     return dict_obj
 
 
-def import_ydd(filepath, join_geometries):
-    ydd_xml = YDD.from_xml_file(filepath)
-    drawable_dict = drawable_dict_to_obj(ydd_xml, filepath)
-    if join_geometries:
-        join_drawable_geometries(drawable_dict)
+def import_ydd(filepath, join_geometries, selection=None, lods=None):
+    if selection is None:
+        ydd_xml = read_xml_file(YDD.from_xml_file, filepath)
+    else:
+        ydd_xml = read_xml_file(lambda path: YDD.from_xml_file(
+            path, selection), filepath, cached=False)
+    with profiler.stage("Create Blender objects"):
+        drawable_dict = drawable_dict_to_obj(ydd_xml, filepath, lods)
+        if join_geometries:
+            join_drawable_geometries(drawable_dict)
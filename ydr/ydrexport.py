@@ -1,6 +1,7 @@
 import os
 import shutil
 import collections
+import numpy
 import bmesh
 import bpy
 from ..resources.drawable import *
@@ -190,83 +191,69 @@ def get_blended_verts(mesh, vertex_groups, bones=None):
     return blend_weights, blend_indices
 
 
-def get_mesh_buffers(obj, mesh, vertex_type, bones=None, export_settings=None):
-    # thanks dexy
-
-    blend_weights, blend_indices = get_blended_verts(
-        mesh, obj.vertex_groups, bones)
-
-    vertices = {}
-    indices = []
-
-    for tri in mesh.loop_triangles:
-        for loop_idx in tri.loops:
-            loop = mesh.loops[loop_idx]
-            vert_idx = loop.vertex_index
-            mesh_layer_idx = 0
-
-            kwargs = {}
-
-            if "position" in vertex_type._fields:
-                if mesh.vertices[vert_idx]:
-                    if export_settings.use_transforms:
-                        pos = float32_list(
-                            obj.matrix_world @ mesh.vertices[vert_idx].co)
-                    else:
-                        pos = float32_list(
-                            obj.matrix_basis @ mesh.vertices[vert_idx].co)
-                    kwargs['position'] = tuple(pos)
-                else:
-                    kwargs["position"] = tuple([0, 0, 0])
-            if "normal" in vertex_type._fields:
-                if loop.normal:
-                    normal = float32_list(loop.normal)
-                    kwargs["normal"] = tuple(normal)
-                else:
-                    kwargs["normal"] = tuple([0, 0, 0])
-            if "blendweights" in vertex_type._fields:
-                kwargs['blendweights'] = tuple(blend_weights[vert_idx])
-            if "blendindices" in vertex_type._fields:
-                kwargs['blendindices'] = tuple(blend_indices[vert_idx])
-            if "tangent" in vertex_type._fields:
-                if loop.tangent:
-                    tangent = float32_list(loop.tangent.to_4d())
-                    tangent[3] = loop.bitangent_sign  # convert to float 32 ?
-                    kwargs["tangent"] = tuple(tangent)
-                else:
-                    kwargs["tangent"] = tuple([0, 0, 0, 0])
-            for i in range(6):
-                if f"texcoord{i}" in vertex_type._fields:
-                    key = f'texcoord{i}'
-                    if mesh_layer_idx < len(mesh.uv_layers):
-                        data = mesh.uv_layers[mesh_layer_idx].data
-                        uv = float32_list(
-                            flip_uv(data[loop_idx].uv))
-                        kwargs[key] = tuple(uv)
-                        mesh_layer_idx += 1
-                    else:
-                        kwargs[key] = (0, 0)
-            for i in range(2):
-                if f"colour{i}" in vertex_type._fields:
-                    key = f'colour{i}'
-                    if i < len(mesh.vertex_colors):
-                        data = mesh.vertex_colors[i].data
-                        kwargs[key] = tuple(
-                            int(val * 255) for val in data[loop_idx].color)
-                    else:
-                        kwargs[key] = (0, 0, 0, 0)
+"""Get the vertex buffer (an array of dtype) and the index buffer of mesh. Every attribute is read and rounded to
+float32 as a whole array, then identical vertices are merged."""
 
-            vertex = vertex_type(**kwargs)
 
-            if vertex in vertices:
-                idx = vertices[vertex]
-            else:
-                idx = len(vertices)
-                vertices[vertex] = idx
-
-            indices.append(idx)
-
-    return vertices.keys(), indices
+def get_mesh_buffers(obj, mesh, dtype, bones=None, export_settings=None):
+    # thanks dexy
+    fields = dtype.names
+    loop_indices = get_attribute_array(
+        mesh.loop_triangles, "loops", 3, numpy.int32).ravel()
+    vertex_indices = get_attribute_array(
+        mesh.loops, "vertex_index", dtype=numpy.int32)[loop_indices]
+
+    vertices = numpy.zeros(len(loop_indices), dtype)
+
+    if "position" in fields:
+        matrix = obj.matrix_world if export_settings.use_transforms else obj.matrix_basis
+        positions = get_attribute_array(mesh.vertices, "co", 3)
+        vertices["position"] = float32_array(
+            transform_points(positions, matrix))[vertex_indices]
+    if "normal" in fields:
+        vertices["normal"] = float32_array(get_attribute_array(
+            mesh.loops, "normal", 3))[loop_indices]
+    if "blendweights" in fields or "blendindices" in fields:
+        blend_weights, blend_indices = get_blended_verts(
+            mesh, obj.vertex_groups, bones)
+        if "blendweights" in fields:
+            vertices["blendweights"] = numpy.clip(
+                blend_weights, 0, 255)[vertex_indices]
+        if "blendindices" in fields:
+            vertices["blendindices"] = numpy.clip(
+                blend_indices, 0, 255)[vertex_indices]
+    if "tangent" in fields:
+        tangents = numpy.empty((len(mesh.loops), 4), numpy.float32)
+        tangents[:, :3] = get_attribute_array(mesh.loops, "tangent", 3)
+        tangents[:, 3] = get_attribute_array(mesh.loops, "bitangent_sign")
+        vertices["tangent"] = float32_array(tangents)[loop_indices]
+
+    uv_layer_index = 0
+    for name in fields:
+        if name.startswith("texcoord") and uv_layer_index < len(mesh.uv_layers):
+            uvs = get_attribute_array(
+                mesh.uv_layers[uv_layer_index].data, "uv", 2).astype(numpy.float64)
+            # Flip the v coordinate like flip_uv()
+            uvs[:, 1] = (uvs[:, 1] - 1.0) * -1
+            vertices[name] = float32_array(uvs)[loop_indices]
+            uv_layer_index += 1
+
+    for i in range(2):
+        name = f"colour{i}"
+        if name in fields and i < len(mesh.vertex_colors):
+            colors = get_attribute_array(
+                mesh.vertex_colors[i].data, "color", 4).astype(numpy.float64)
+            vertices[name] = (colors * 255).astype(numpy.int64)[loop_indices]
+
+    # Merge identical vertices, numbered in the order they first appear in like the loops
+    keys = vertices.view(numpy.dtype((numpy.void, dtype.itemsize)))
+    _, first, inverse = numpy.unique(
+        keys, return_index=True, return_inverse=True)
+    order = numpy.argsort(first)
+    new_index = numpy.empty_like(order)
+    new_index[order] = numpy.arange(len(order))
+
+    return vertices[first[order]], new_index[inverse.ravel()].astype(numpy.uint32)
 
 
 def get_semantic_from_object(shader, mesh):
@@ -348,7 +335,7 @@ def geometry_from_object(obj, mats, bones=None, export_settings=None):
 
     geometry.vertex_buffer.layout = layout.value
     vertex_buffer, index_buffer = get_mesh_buffers(
-        obj, mesh, layout.vertex_type, bones, export_settings)
+        obj, mesh, layout.dtype, bones, export_settings)
 
     geometry.vertex_buffer.data = vertex_buffer
     geometry.index_buffer.data = index_buffer
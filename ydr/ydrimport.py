@@ -1,23 +1,160 @@
 import os
+import hashlib
 import bpy
+from bpy.app.handlers import persistent
+import numpy
 from mathutils import Matrix
 from .shader_materials import create_shader, create_tinted_shader_graph, get_detail_extra_sampler
 from ..ybn.ybnimport import composite_to_obj, bound_to_obj
 from ..sollumz_properties import SOLLUMZ_UI_NAMES, LODLevel, TextureFormat, TextureUsage, SollumType, LightType
 from ..resources.drawable import *
-from ..tools.meshhelper import flip_uv
+from ..resources.codewalker_xml import get_content_key
+from ..tools.meshhelper import create_mesh_from_triangles, get_attribute_array
 from ..tools.utils import *
 from ..tools.blenderhelper import *
+from ..tools.texturehelper import get_texture_index
 from ..tools.drawablehelper import join_drawable_geometries
+from ..resources.profiler import profiler
 from ..resources.shader import ShaderManager
 
 
+# Custom property storing the key of the shader a material was created from, so it can be reused after the .blend file
+# is saved and opened again
+MATERIAL_KEY_PROPERTY = "sollumz_material_key"
+
+# Material key -> (name, address) of the material created from the shader with that key
+material_names = {}
+# Whether the keys stored in the materials of the open .blend file were collected into material_names
+material_keys_collected = False
+
+
+"""Get the path of the texture named texture_name from the texture folder of the imported file, or else from the shared
+texture folder. None if neither has the texture"""
+
+
+def get_texture_path(texture_name, texture_folder, shared_textures):
+    texture_path = os.path.join(texture_folder, texture_name + ".dds")
+    if os.path.isfile(texture_path):
+        return texture_path
+    return shared_textures.get_path(texture_name)
+
+
+"""Get a key of everything the material of shader is created from: the shader name, filename, render bucket and
+parameters, the paths its textures are loaded from and the embedded textures it uses. Textures without a path get an
+image named after the texture, which the shader parameters already cover, so files using the same textures share
+their materials"""
+
+
+def get_material_key(shader, texture_paths, embedded_textures):
+    textures = []
+    for param in shader.parameters:
+        if param.type == TextureShaderParameter.type:
+            texture_path = texture_paths.get(param.texture_name)
+            if texture_path:
+                texture_path = os.path.normcase(os.path.abspath(texture_path))
+            textures.append((texture_path, get_content_key(
+                embedded_textures.get(param.texture_name))))
+    key = (get_content_key(shader), tuple(textures))
+    return hashlib.sha1(repr(key).encode()).hexdigest()
+
+
+"""Collect the keys stored in the materials of the open .blend file"""
+
+
+def collect_material_keys():
+    global material_keys_collected
+    material_names.clear()
+    for material in bpy.data.materials:
+        key = material.get(MATERIAL_KEY_PROPERTY)
+        if key:
+            material_names[key] = (material.name, material.as_pointer())
+    material_keys_collected = True
+
+
+def lookup_material(key, persist):
+    name, pointer = material_names[key]
+    material = bpy.data.materials.get(name)
+    if material is None or material.as_pointer() != pointer:
+        return None
+    if persist and material.get(MATERIAL_KEY_PROPERTY) != key:
+        return None
+    return material
+
+
+"""Get the material created from the shader with key, by this session or, if persist, by the session that saved the
+open .blend file. None if there is no such material"""
+
+
+def get_cached_material(key, persist):
+    if persist and not material_keys_collected:
+        collect_material_keys()
+
+    if key not in material_names:
+        return None
+
+    material = lookup_material(key, persist)
+    if material is None and persist:
+        # The material was removed or renamed, or another material took its name since the keys were collected
+        collect_material_keys()
+        if key in material_names:
+            material = lookup_material(key, persist)
+    if material is None:
+        material_names.pop(key, None)
+
+    return material
+
+
+def cache_material(material, key, persist):
+    if persist:
+        material[MATERIAL_KEY_PROPERTY] = key
+    material_names[key] = (material.name, material.as_pointer())
+
+
+@persistent
+def on_file_loaded(_):
+    global material_keys_collected
+    material_names.clear()
+    material_keys_collected = False
+
+
+def register():
+    bpy.app.handlers.load_post.append(on_file_loaded)
+
+
+def unregister():
+    bpy.app.handlers.load_post.remove(on_file_loaded)
+
+
 def shadergroup_to_materials(shadergroup, filepath):
     materials = []
 
-    texture_folder = os.path.dirname(
-        filepath) + "\\" + os.path.basename(filepath)[:-8]
+    texture_folder = os.path.join(os.path.dirname(
+        filepath), os.path.basename(filepath)[:-8])
+    preferences = get_addon_preferences()
+    shared_folder = preferences.shared_texture_folder
+    shared_textures = get_texture_index(shared_folder)
+    existing_images = {image.name: image for image in bpy.data.images}
+    embedded_textures = {}
+    if shadergroup.texture_dictionary != None:
+        embedded_textures = {
+            texture.name: texture for texture in shadergroup.texture_dictionary}
+    # Texture name -> path the texture is loaded from, None if it isn't found
+    texture_paths = {}
+
     for shader in shadergroup.shaders:
+        for param in shader.parameters:
+            if param.type == TextureShaderParameter.type and param.texture_name not in texture_paths:
+                texture_paths[param.texture_name] = get_texture_path(
+                    param.texture_name, texture_folder, shared_textures)
+
+        if preferences.reuse_materials:
+            material_key = get_material_key(
+                shader, texture_paths, embedded_textures)
+            material = get_cached_material(
+                material_key, preferences.persist_material_keys)
+            if material is not None:
+                materials.append(material)
+                continue
 
         material = create_shader(shader.name, shader.filename)
 
@@ -28,34 +165,19 @@ def shadergroup_to_materials(shadergroup, filepath):
             for n in material.node_tree.nodes:
                 if isinstance(n, bpy.types.ShaderNodeTexImage):
                     if param.name == n.name:
-                        texture_path = os.path.join(
-                            texture_folder, param.texture_name + ".dds")
-                        addon_key = __name__.split('.')[0]
-                        shared_folder = bpy.context.preferences.addons[
-                            addon_key].preferences.shared_texture_folder
-                        shared_folder_dirs = [x[0]
-                                              for x in os.walk(shared_folder)]
-                        if(os.path.isfile(texture_path)):
+                        texture_path = texture_paths.get(
+                            param.texture_name)
+                        if texture_path:
                             img = bpy.data.images.load(
                                 texture_path, check_existing=True)
                             n.image = img
-                        # check shared texture folder
-                        else:
-                            for d in shared_folder_dirs:
-                                t_path = os.path.join(
-                                    d, param.texture_name + ".dds")
-                                if(os.path.isfile(t_path)):
-                                    img = bpy.data.images.load(
-                                        t_path, check_existing=True)
-                                    n.image = img
                         if not n.image:
                             # Check for existing texture
-                            existing_texture = None
-                            for image in bpy.data.images:
-                                if image.name == param.texture_name:
-                                    existing_texture = image
+                            existing_texture = existing_images.get(
+                                param.texture_name)
                             texture = bpy.data.images.new(
                                 name=param.texture_name, width=512, height=512) if not existing_texture else existing_texture
+                            existing_images[texture.name] = texture
                             n.image = texture
                             # n.image = bpy.data.images.new(
                             #     name=param.texture_name, width=512, height=512)
@@ -65,32 +187,31 @@ def shadergroup_to_materials(shadergroup, filepath):
                             n.image.colorspace_settings.name = "Non-Color"
 
                         # Assign embedded texture dictionary properties
-                        if shadergroup.texture_dictionary != None:
-                            for texture in shadergroup.texture_dictionary:
-                                if texture.name == param.texture_name:
-                                    n.texture_properties.embedded = True
-                                    try:
-                                        format = TextureFormat[texture.format.replace(
-                                            'D3DFMT_', '')]
-                                        n.texture_properties.format = format
-                                    except AttributeError:
-                                        print(
-                                            f"Failed to set texture format: format '{texture.format}' unknown.")
-
-                                    try:
-                                        usage = TextureUsage[texture.usage]
-                                        n.texture_properties.usage = usage
-                                    except AttributeError:
-                                        print(
-                                            f"Failed to set texture usage: usage '{texture.usage}' unknown.")
-
-                                    n.texture_properties.extra_flags = texture.extra_flags
-
-                                    for prop in dir(n.texture_flags):
-                                        for uf in texture.usage_flags:
-                                            if(uf.lower() == prop):
-                                                setattr(
-                                                    n.texture_flags, prop, True)
+                        texture = embedded_textures.get(param.texture_name)
+                        if texture != None:
+                            n.texture_properties.embedded = True
+                            try:
+                                format = TextureFormat[texture.format.replace(
+                                    'D3DFMT_', '')]
+                                n.texture_properties.format = format
+                            except AttributeError:
+                                print(
+                                    f"Failed to set texture format: format '{texture.format}' unknown.")
+
+                            try:
+                                usage = TextureUsage[texture.usage]
+                                n.texture_properties.usage = usage
+                            except AttributeError:
+                                print(
+                                    f"Failed to set texture usage: usage '{texture.usage}' unknown.")
+
+                            n.texture_properties.extra_flags = texture.extra_flags
+
+                            for prop in dir(n.texture_flags):
+                                for uf in texture.usage_flags:
+                                    if(uf.lower() == prop):
+                                        setattr(
+                                            n.texture_flags, prop, True)
 
                         if param.name == "BumpSampler" and hasattr(n.image, 'colorspace_settings'):
                             n.image.colorspace_settings.name = 'Non-Color'
@@ -113,105 +234,128 @@ def shadergroup_to_materials(shadergroup, filepath):
             dtl = material.node_tree.nodes["DetailSampler"]
             dtl_ext.image = dtl.image
 
+        if preferences.reuse_materials:
+            cache_material(material, material_key,
+                           preferences.persist_material_keys)
+
         materials.append(material)
 
     return materials
 
 
-def create_uv_layer(mesh, num, name, texcoords):
+"""Slice or pad the columns of per vertex values to width, the number of components of a Blender layer. The vertex
+layout can give a layer fewer or more components, missing ones are filled with fill"""
+
+
+def fit_columns(values, width, fill):
+    values = numpy.array(values, dtype=numpy.float64)
+    if values.ndim == 1:
+        values = values[:, numpy.newaxis]
+    if values.shape[1] >= width:
+        return values[:, :width]
+    fitted = numpy.full((len(values), width), fill, dtype=numpy.float64)
+    fitted[:, :values.shape[1]] = values
+    return fitted
+
+
+"""Create a uv layer from per vertex texcoords, gathered for every loop through loop_vertex_indices and set in one call"""
+
+
+def create_uv_layer(mesh, num, name, texcoords, loop_vertex_indices):
     mesh.uv_layers.new()
     uv_layer = mesh.uv_layers[num]
     uv_layer.name = name
-    for i in range(len(uv_layer.data)):
-        uv = flip_uv(texcoords[mesh.loops[i].vertex_index])
-        uv_layer.data[i].uv = uv
+    uvs = fit_columns(texcoords, 2, 0)[loop_vertex_indices]
+    # Flip the v coordinate like flip_uv()
+    uvs[:, 1] = (uvs[:, 1] - 1) * -1
+    uv_layer.data.foreach_set("uv", uvs.astype(numpy.float32).ravel())
 
 
-def create_vertexcolor_layer(mesh, num, name, colors):
+"""Create a vertex color layer from per vertex 0-255 colors, gathered for every loop through loop_vertex_indices and set
+in one call. Colors without alpha are opaque"""
+
+
+def create_vertexcolor_layer(mesh, num, name, colors, loop_vertex_indices):
     mesh.vertex_colors.new(name="Vertex Colors " + str(num))
     color_layer = mesh.vertex_colors[num]
     color_layer.name = name
-    for i in range(len(color_layer.data)):
-        rgba = colors[mesh.loops[i].vertex_index]
-        color_layer.data[i].color = divide_list(rgba, 255)
+    rgba = fit_columns(colors, 4, 255)[loop_vertex_indices] / 255
+    color_layer.data.foreach_set("color", rgba.astype(numpy.float32).ravel())
 
 
-def geometry_to_obj(geometry, bones=None, name=None):
+"""Create a vertex group for every bone used by the blend weights of the vertices and assign the weights.
+Influences are grouped by bone and weight, so every group gets one add call per distinct weight"""
+
 
-    vertices = []
-    faces = []
-    normals = []
-    texcoords = {}
-    colors = {}
+def create_vertex_groups(obj, bones, blendweights, blendindices):
+    vertex_indices, influences = numpy.nonzero(blendweights)
+    groups = blendindices[vertex_indices, influences].astype(numpy.int32)
+    weights = blendweights[vertex_indices, influences].astype(numpy.int32)
 
-    has_normals = False
+    # Groups are created in bone order, skipping the bones without any weight
+    vertex_groups = {}
+    for index in numpy.unique(groups).tolist():
+        if index < len(bones):
+            name = bones[index].name
+        else:
+            name = "UNKNOWN_BONE." + str(index)
+        vertex_groups[index] = obj.vertex_groups.new(name=name)
+
+    keys = groups * 256 + weights
+    order = numpy.argsort(keys, kind="stable")
+    keys, starts = numpy.unique(keys[order], return_index=True)
+    for key, vertices in zip(keys.tolist(), numpy.split(vertex_indices[order], starts[1:])):
+        index, weight = divmod(key, 256)
+        vertex_groups[index].add(vertices.tolist(), weight / 255, "ADD")
+
+
+def geometry_to_obj(geometry, bones=None, name=None):
 
     # gather data
     data = geometry.vertex_buffer.get_data()
-    for vertex in data:
-        vertices.append(vertex.position)
-        if hasattr(vertex, "normal"):
-            has_normals = True
-            normals.append(vertex.normal)
-
-        for key, value in vertex._asdict().items():
-            if 'texcoord' in key:
-                if not key in texcoords.keys():
-                    texcoords[key] = []
-                texcoords[key].append(value)
-            if 'colour' in key:
-                if not key in colors.keys():
-                    colors[key] = []
-                colors[key].append(value)
-
-    indices = geometry.index_buffer.data
-    # Split indices into groups of 3
-    faces = [indices[i * 3:(i + 1) * 3]
-             for i in range((len(indices) + 3 - 1) // 3)]
+    fields = data.dtype.names
+
+    has_normals = "normal" in fields
+    normals = data["normal"].tolist() if has_normals else []
+    texcoords = {key: data[key]
+                 for key in fields if 'texcoord' in key}
+    colors = {key: data[key]
+              for key in fields if 'colour' in key}
 
     # create mesh
-    mesh = bpy.data.meshes.new(SOLLUMZ_UI_NAMES[SollumType.DRAWABLE_GEOMETRY])
-    mesh.from_pydata(vertices, [], faces)
+    mesh = create_mesh_from_triangles(
+        SOLLUMZ_UI_NAMES[SollumType.DRAWABLE_GEOMETRY], data["position"], geometry.index_buffer.data)
 
     # set normals
     if has_normals:
-        mesh.polygons.foreach_set("use_smooth", [True] * len(mesh.polygons))
+        mesh.polygons.foreach_set("use_smooth", numpy.ones(
+            len(mesh.polygons), dtype=bool))
         mesh.normals_split_custom_set_from_vertices(normals)
         mesh.use_auto_smooth = True
 
+    loop_vertex_indices = get_attribute_array(
+        mesh.loops, "vertex_index", dtype=numpy.int32)
+
     # set uvs
     i = 0
     for layer_name, coords in texcoords.items():
-        create_uv_layer(mesh, i, layer_name, coords)
+        create_uv_layer(mesh, i, layer_name, coords, loop_vertex_indices)
         i += 1
 
     # set vertex colors
     i = 0
     for layer_name, color in colors.items():
-        create_vertexcolor_layer(mesh, i, layer_name, color)
+        create_vertexcolor_layer(
+            mesh, i, layer_name, color, loop_vertex_indices)
         i += 1
 
     obj = bpy.data.objects.new(name + "_mesh", mesh)
 
     # set weights
-    if hasattr(data[0], "blendweights"):
-        if (bones != None and len(bones) > 0 and data[0].blendweights is not None and len(data) > 0):
-            num = max(256, len(bones))
-            for i in range(num):
-                if (i < len(bones)):
-                    obj.vertex_groups.new(name=bones[i].name)
-                else:
-                    obj.vertex_groups.new(name="UNKNOWN_BONE." + str(i))
-
-            for vertex_idx, vertex in enumerate(data):
-                for i in range(0, 4):
-                    weight = vertex.blendweights[i] / 255
-                    index = vertex.blendindices[i]
-                    if (weight > 0.0):
-                        obj.vertex_groups[index].add(
-                            [vertex_idx], weight, "ADD")
-
-            remove_unused_vertex_groups_of_mesh(obj)
+    if "blendweights" in fields:
+        if (bones != None and len(bones) > 0 and len(data) > 0):
+            create_vertex_groups(
+                obj, bones, data["blendweights"], data["blendindices"])
 
     return obj
 
@@ -398,7 +542,10 @@ def light_to_obj(light, idx):
     return lobj
 
 
-def drawable_to_obj(drawable, filepath, name, bones_override=None, materials=None):
+"""Create the objects of drawable. lods, if given, are the values of the LOD levels whose models are imported"""
+
+
+def drawable_to_obj(drawable, filepath, name, bones_override=None, materials=None, lods=None):
 
     if not materials:
         materials = shadergroup_to_materials(drawable.shader_group, filepath)
@@ -434,7 +581,7 @@ def drawable_to_obj(drawable, filepath, name, bones_override=None, materials=Non
     if bones_override is not None:
         bones = bones_override
 
-    if drawable.bound and drawable.bound.type == SollumType.BOUND_COMPOSITE:
+    if isinstance(drawable.bound, BoundsComposite):
         bobj = composite_to_obj(
             drawable.bound, SOLLUMZ_UI_NAMES[SollumType.BOUND_COMPOSITE], True)
         bobj.parent = obj
@@ -443,25 +590,16 @@ def drawable_to_obj(drawable, filepath, name, bones_override=None, materials=Non
         if bobj:
             bobj.parent = obj
 
-    for model in drawable.drawable_models_high:
-        dobj = drawable_model_to_obj(
-            model, materials, drawable.name, LODLevel.HIGH, bones=bones)
-        dobj.parent = obj
-
-    for model in drawable.drawable_models_med:
-        dobj = drawable_model_to_obj(
-            model, materials, drawable.name, LODLevel.MEDIUM, bones=bones)
-        dobj.parent = obj
-
-    for model in drawable.drawable_models_low:
-        dobj = drawable_model_to_obj(
-            model, materials, drawable.name, LODLevel.LOW, bones=bones)
-        dobj.parent = obj
+    for lod, models in ((LODLevel.HIGH, drawable.drawable_models_high), (LODLevel.MEDIUM, drawable.drawable_models_med),
+                        (LODLevel.LOW, drawable.drawable_models_low), (LODLevel.VERYLOW, drawable.drawable_models_vlow)):
+        # Vertex data is decoded on first use, so skipped LODs are never decoded either
+        if lods is not None and lod.value not in lods:
+            continue
 
-    for model in drawable.drawable_models_vlow:
-        dobj = drawable_model_to_obj(
-            model, materials, drawable.name, LODLevel.VERYLOW, bones=bones)
-        dobj.parent = obj
+        for model in models:
+            dobj = drawable_model_to_obj(
+                model, materials, drawable.name, lod, bones=bones)
+            dobj.parent = obj
 
     for model in obj.children:
         if model.sollum_type != SollumType.DRAWABLE_MODEL:
@@ -481,9 +619,10 @@ def drawable_to_obj(drawable, filepath, name, bones_override=None, materials=Non
     return obj
 
 
-def import_ydr(filepath, join_geometries):
-    ydr_xml = YDR.from_xml_file(filepath)
-    drawable = drawable_to_obj(ydr_xml, filepath, os.path.basename(
-        filepath.replace(YDR.file_extension, '')))
-    if join_geometries:
-        join_drawable_geometries(drawable)
+def import_ydr(filepath, join_geometries, lods=None):
+    ydr_xml = read_xml_file(YDR.from_xml_file, filepath)
+    with profiler.stage("Create Blender objects"):
+        drawable = drawable_to_obj(ydr_xml, filepath, os.path.basename(
+            filepath.replace(YDR.file_extension, '')), lods=lods)
+        if join_geometries:
+            join_drawable_geometries(drawable)
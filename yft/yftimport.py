@@ -4,7 +4,8 @@ from ..resources.fragment import YFT
 from ..ydr.ydrimport import drawable_to_obj, shadergroup_to_materials
 from ..ybn.ybnimport import composite_to_obj
 from ..sollumz_properties import SOLLUMZ_UI_NAMES, SollumType
-from ..tools.blenderhelper import copy_object
+from ..tools.blenderhelper import copy_object, read_xml_file
+from ..resources.profiler import profiler
 
 
 def create_lod_obj(name, lod, filepath, materials):
@@ -205,5 +206,6 @@ def fragment_to_obj(fragment, filepath):
 
 
 def import_yft(filepath):
-    yft_xml = YFT.from_xml_file(filepath)
-    fragment_to_obj(yft_xml, filepath)
+    yft_xml = read_xml_file(YFT.from_xml_file, filepath)
+    with profiler.stage("Create Blender objects"):
+        fragment_to_obj(yft_xml, filepath)